@@ -4,6 +4,7 @@ ArgoCD Agent with A2A SDK integration
 """
 import asyncio
 import os
+from contextlib import asynccontextmanager
 from typing import Optional
 
 import click
@@ -14,6 +15,7 @@ from a2a.server.tasks import InMemoryPushNotifier, InMemoryTaskStore
 from a2a.types import AgentCard, AgentSkill, AgentCapabilities
 
 from app.agent import ArgoCDAgent
+from app.mcp_pool import mcp_pool
 
 
 def create_agent_card() -> AgentCard:
@@ -97,8 +99,9 @@ def main(host: str, port: int, log_level: str):
     try:
         # Create the server components following currencyAgent pattern
         httpx_client = httpx.AsyncClient()
+        agent_executor = ArgoCDAgentExecutor()
         request_handler = DefaultRequestHandler(
-            agent_executor=ArgoCDAgentExecutor(),
+            agent_executor=agent_executor,
             task_store=InMemoryTaskStore(),
             push_notifier=InMemoryPushNotifier(httpx_client),
         )
@@ -107,8 +110,22 @@ def main(host: str, port: int, log_level: str):
             http_handler=request_handler
         )
 
+        @asynccontextmanager
+        async def lifespan(app):
+            # Keep the pooled MCP stdio sessions open for the lifetime of the
+            # server; each session is held by its own owner task in mcp_pool.
+            try:
+                await agent_executor.agent.connect()
+            except Exception as e:
+                print(f"⚠️  ArgoCD tools unavailable at startup, will retry on first request: {e}")
+            try:
+                yield
+            finally:
+                await agent_executor.agent.cleanup()
+                await mcp_pool.aclose()
+
         import uvicorn
-        uvicorn.run(server.build(), host=host, port=port)
+        uvicorn.run(server.build(lifespan=lifespan), host=host, port=port)
         
     except Exception as e:
         print(f"❌ Error starting ArgoCD Agent server: {e}")
@@ -1,25 +1,93 @@
 import os
 import asyncio
+import functools
+import shlex
+from collections import OrderedDict
 from collections.abc import AsyncIterable
 from typing import Any, Literal
 
-from langchain_core.messages import AIMessage, ToolMessage
+import httpx
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.prebuilt import create_react_agent
 from pydantic import BaseModel
 
 from langchain_mcp_adapters.tools import load_mcp_tools
-from mcp import ClientSession
-from mcp.client.stdio import stdio_client, StdioServerParameters
+from mcp.client.stdio import StdioServerParameters
+
+from app.mcp_pool import mcp_pool
+
+
+class LRUCheckpointer(MemorySaver):
+    """
+    In-memory checkpointer that keeps at most max_threads conversations.
+
+    Threads are ordered by last access; once the limit is exceeded the
+    least recently used thread's checkpoints and writes are deleted.
+    """
+
+    def __init__(self, max_threads: int):
+        super().__init__()
+        self.max_threads = max_threads
+        self._threads: OrderedDict[str, None] = OrderedDict()
+
+    def _touch(self, config):
+        thread_id = config["configurable"]["thread_id"]
+        self._threads[thread_id] = None
+        self._threads.move_to_end(thread_id)
+        while len(self._threads) > self.max_threads:
+            evicted, _ = self._threads.popitem(last=False)
+            self.delete_thread(evicted)
+
+    def get_tuple(self, config):
+        thread_id = config["configurable"].get("thread_id")
+        if thread_id in self._threads:
+            self._threads.move_to_end(thread_id)
+        return super().get_tuple(config)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+        self._touch(next_config)
+        return next_config
+
+
+memory = LRUCheckpointer(int(os.getenv("ARGOCD_AGENT_MEMORY_MAX", "1000")))
+
+# Resolved once at import instead of on every agent init and tool load
+_ARGOCD_BASE_URL = os.environ.setdefault("ARGOCD_BASE_URL", "https://9.30.147.51:8080/")
+_ARGOCD_API_TOKEN = os.environ.setdefault("ARGOCD_API_TOKEN", "")
+os.environ.setdefault("NODE_TLS_REJECT_UNAUTHORIZED", "0")
+
+_MCP_COMMAND = os.getenv('ARGOCD_MCP_COMMAND', 'npx argocd-mcp@latest stdio')
+
+
+@functools.cache
+def _server_params() -> StdioServerParameters:
+    """Parse ARGOCD_MCP_COMMAND on first use so a bad value fails the MCP attempt, not the import."""
+    cmd = shlex.split(_MCP_COMMAND)
+    if not cmd:
+        raise ValueError("ARGOCD_MCP_COMMAND is empty")
+    return StdioServerParameters(command=cmd[0], args=cmd[1:])
 
-memory = MemorySaver()
 
 class ResponseFormat(BaseModel):
     """Response format for the ArgoCD agent."""
     status: Literal['input_required', 'completed', 'error'] = 'input_required'
     message: str
 
+# ResponseFormat.status -> (is_task_complete, require_user_input)
+_STATUS_FLAGS = {
+    'input_required': (False, True),
+    'error': (False, True),
+    'completed': (True, False),
+}
+
+# Streamed model text is forwarded in sentence-sized pieces rather than one
+# status update per token; a piece is sent at a sentence end or once it
+# reaches STREAM_FLUSH_CHARS
+STREAM_FLUSH_CHARS = 200
+_SENTENCE_ENDINGS = ('.', '!', '?', ':', '\n')
+
 class ArgoCDAgent:
     """
     ArgoCDAgent - a specialized assistant for ArgoCD management via MCP stdio.
@@ -42,48 +110,85 @@ class ArgoCDAgent:
 
     def __init__(self):
         self.model = ChatGoogleGenerativeAI(model='gemini-2.0-flash')
-        os.environ["NODE_TLS_REJECT_UNAUTHORIZED"] = "0"
-        os.environ["ARGOCD_BASE_URL"] = os.getenv("ARGOCD_BASE_URL", "https://9.30.147.51:8080/")
-        os.environ["ARGOCD_API_TOKEN"] = os.getenv("ARGOCD_API_TOKEN", "")
         self.tools = []
         self.mcp_session = None
-        self.graph = create_react_agent(
-            self.model,
-            tools=self.tools,
-            checkpointer=memory,
-            prompt=self.SYSTEM_INSTRUCTION,
-            response_format=ResponseFormat,
-        )
+        self._http = None
+        self.graph = None
+        self._graph_lock = asyncio.Lock()
+        self._graph_ready = asyncio.Event()
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.cleanup()
+
+    async def connect(self):
+        """
+        Attach to the pooled MCP stdio server and load its tools.
+
+        The subprocess and session are owned by mcp_pool and stay alive until
+        mcp_pool.aclose(), so every tool invocation reuses the same connection.
+        """
+        await self._ensure_graph()
+
+    async def _ensure_graph(self):
+        """
+        Load the MCP tools and compile the react graph exactly once.
+
+        Concurrent callers wait on the lock and reuse the compiled graph. If
+        initialization fails the ready flag stays unset so a later call retries.
+        If the pooled MCP session the tools are bound to has died, the graph
+        is dropped and rebuilt against a new session.
+        """
+        if self._graph_ready.is_set() and not self._mcp_session_lost():
+            return self.graph
+        async with self._graph_lock:
+            if self._mcp_session_lost():
+                print("MCP stdio session closed; reconnecting")
+                await self.disconnect()
+            if not self._graph_ready.is_set():
+                self.tools = await self._init_mcp_tools()
+                self.graph = create_react_agent(
+                    self.model,
+                    tools=self.tools,
+                    checkpointer=memory,
+                    prompt=self.SYSTEM_INSTRUCTION,
+                    response_format=ResponseFormat,
+                )
+                self._graph_ready.set()
+        return self.graph
+
+    def _mcp_session_lost(self) -> bool:
+        """True when the tools were loaded from an MCP session the pool no longer holds."""
+        return self.mcp_session is not None and mcp_pool.session(_MCP_COMMAND) is not self.mcp_session
+
+    async def disconnect(self):
+        """Drop this agent's tools; the shared session stays in mcp_pool."""
+        self.mcp_session = None
+        self.tools = []
+        self.graph = None
+        self._graph_ready.clear()
 
     async def _init_mcp_tools(self):
         """Initialize MCP tools using stdio transport, with direct API fallback."""
         if self.tools:
             return self.tools
             
-        # Set environment variables before creating the server parameters
-        os.environ["ARGOCD_BASE_URL"] = os.getenv("ARGOCD_BASE_URL", "https://9.30.147.51:8080/")
-        os.environ["ARGOCD_API_TOKEN"] = os.getenv("ARGOCD_API_TOKEN", "")
-        os.environ["NODE_TLS_REJECT_UNAUTHORIZED"] = "0"
-        
         # First try MCP stdio transport
-        mcp_command_str = os.getenv('ARGOCD_MCP_COMMAND', 'npx argocd-mcp@latest stdio')
-        cmd_parts = mcp_command_str.split()
-        command = cmd_parts[0]
-        args = cmd_parts[1:] if len(cmd_parts) > 1 else []
-        
-        server_params = StdioServerParameters(command=command, args=args)
-        
         try:
             # Use a shorter timeout to fail faster if there are issues
             async with asyncio.timeout(10):
-                async with stdio_client(server_params) as (read_stream, write_stream):
-                    self.mcp_session = ClientSession(read_stream, write_stream)
-                    tools = await load_mcp_tools(self.mcp_session)
-                    print("Successfully initialized MCP stdio transport")
-                    return tools
+                self.mcp_session = await mcp_pool.get(_MCP_COMMAND, _server_params())
+                tools = await load_mcp_tools(self.mcp_session)
+                print("Successfully initialized MCP stdio transport")
+                return tools
                     
         except Exception as e:
             print(f"MCP stdio transport failed: {str(e)}")
+            # Leave the pooled session alone: other agents may be using it
+            self.mcp_session = None
             print("Falling back to direct ArgoCD API client...")
             
             # Fallback to direct ArgoCD API
@@ -154,16 +259,9 @@ class ArgoCDAgent:
         Returns:
             The agent's response as a dictionary
         """
-        if not self.tools:
+        if not self._graph_ready.is_set() or self._mcp_session_lost():
             try:
-                self.tools = await self._init_mcp_tools()
-                self.graph = create_react_agent(
-                    self.model,
-                    tools=self.tools,
-                    checkpointer=memory,
-                    prompt=self.SYSTEM_INSTRUCTION,
-                    response_format=ResponseFormat,
-                )
+                await self._ensure_graph()
             except Exception as e:
                 return {
                     'is_task_complete': False,
@@ -171,7 +269,7 @@ class ArgoCDAgent:
                     'content': f"Error initializing MCP tools: {str(e)}",
                 }
         config = {'configurable': {'thread_id': context_id}}
-        self.graph.invoke({'messages': [('user', query)]}, config)
+        await self.graph.ainvoke({'messages': [('user', query)]}, config)
         return self.get_agent_response(config)
 
     async def stream(self, query, context_id) -> AsyncIterable[dict[str, Any]]:
@@ -185,41 +283,50 @@ class ArgoCDAgent:
         Yields:
             Dictionaries containing the streaming response state
         """
-        if not self.tools:
+        if not self._graph_ready.is_set() or self._mcp_session_lost():
             yield {'is_task_complete': False, 'require_user_input': False, 'content': 'Initializing ArgoCD tools...'}
             try:
-                self.tools = await self._init_mcp_tools()
-                self.graph = create_react_agent(
-                    self.model,
-                    tools=self.tools,
-                    checkpointer=memory,
-                    prompt=self.SYSTEM_INSTRUCTION,
-                    response_format=ResponseFormat,
-                )
+                await self._ensure_graph()
             except Exception as e:
                 yield {'is_task_complete': False, 'require_user_input': True, 'content': f"Error initializing MCP tools: {str(e)}"}
                 return
         inputs = {'messages': [('user', query)]}
         config = {'configurable': {'thread_id': context_id}}
-        for item in self.graph.stream(inputs, config, stream_mode='values'):
-            message = item['messages'][-1]
-            if isinstance(message, AIMessage) and message.tool_calls:
+        pending = []
+        pending_len = 0
+        async for event in self.graph.astream_events(inputs, config, version='v2'):
+            kind = event['event']
+            if kind == 'on_chat_model_stream':
+                # Buffer partial model output until a sentence or size boundary
+                content = event['data']['chunk'].content
+                if content and isinstance(content, str):
+                    pending.append(content)
+                    pending_len += len(content)
+                    if pending_len >= STREAM_FLUSH_CHARS or content.rstrip(' ').endswith(_SENTENCE_ENDINGS):
+                        yield {'is_task_complete': False, 'require_user_input': False, 'content': ''.join(pending)}
+                        pending.clear()
+                        pending_len = 0
+                continue
+            if pending and kind in ('on_chat_model_end', 'on_tool_start', 'on_tool_end'):
+                # Send what is left of the model output before the next step
+                yield {'is_task_complete': False, 'require_user_input': False, 'content': ''.join(pending)}
+                pending.clear()
+                pending_len = 0
+            if kind == 'on_tool_start':
                 yield {'is_task_complete': False, 'require_user_input': False, 'content': 'Looking up ArgoCD information...'}
-            elif isinstance(message, ToolMessage):
+            elif kind == 'on_tool_end':
                 yield {'is_task_complete': False, 'require_user_input': False, 'content': 'Processing ArgoCD tool response...'}
+        if pending:
+            yield {'is_task_complete': False, 'require_user_input': False, 'content': ''.join(pending)}
         yield self.get_agent_response(config)
     
-    async def __del__(self):
-        """Clean up resources when the agent is destroyed."""
-        await self.cleanup()
-        
     async def cleanup(self):
         """Explicitly clean up resources when done with the agent."""
-        # Reset the session and process references
-        self.mcp_session = None
-        self.tools = []
-        if hasattr(self, '_tools_loaded'):
-            delattr(self, '_tools_loaded')
+        # Drop this agent's MCP tools (the shared session stays in mcp_pool) and close the HTTP client
+        await self.disconnect()
+        if self._http is not None:
+            http, self._http = self._http, None
+            await http.aclose()
             
     async def check_argocd_server(self) -> tuple[bool, str]:
         """
@@ -228,10 +335,8 @@ class ArgoCDAgent:
         Returns:
             A tuple of (is_accessible, message)
         """
-        import httpx
-        
-        base_url = os.getenv("ARGOCD_BASE_URL", "https://9.30.147.51:8080/")
-        api_token = os.getenv("ARGOCD_API_TOKEN", "")
+        base_url = _ARGOCD_BASE_URL
+        api_token = _ARGOCD_API_TOKEN
         
         if not api_token:
             return False, "ArgoCD API token is not configured"
@@ -247,16 +352,21 @@ class ArgoCDAgent:
                 "Content-Type": "application/json"
             }
             
-            # Create a client that ignores SSL verification
-            async with httpx.AsyncClient(verify=False, timeout=10.0) as client:
-                # Try the version endpoint first
-                response = await client.get(f"{base_url}/api/version", headers=headers)
-                if response.status_code == 200:
-                    version_data = response.json()
-                    version = version_data.get('Version', 'unknown')
-                    return True, f"ArgoCD server is accessible (version: {version})"
-                else:
-                    return False, f"ArgoCD server returned status {response.status_code}"
+            # Reuse one keep-alive client that ignores SSL verification
+            self._http = self._http or httpx.AsyncClient(
+                verify=False,
+                http2=True,
+                timeout=10.0,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+            )
+            # Try the version endpoint first
+            response = await self._http.get(f"{base_url}/api/version", headers=headers)
+            if response.status_code == 200:
+                version_data = response.json()
+                version = version_data.get('Version', 'unknown')
+                return True, f"ArgoCD server is accessible (version: {version})"
+            else:
+                return False, f"ArgoCD server returned status {response.status_code}"
                         
         except httpx.TimeoutException:
             return False, "Timeout connecting to ArgoCD server"
@@ -280,22 +390,12 @@ class ArgoCDAgent:
         if structured_response and isinstance(
             structured_response, ResponseFormat
         ):
-            if structured_response.status == 'input_required':
-                return {
-                    'is_task_complete': False,
-                    'require_user_input': True,
-                    'content': structured_response.message,
-                }
-            if structured_response.status == 'error':
-                return {
-                    'is_task_complete': False,
-                    'require_user_input': True,
-                    'content': structured_response.message,
-                }
-            if structured_response.status == 'completed':
+            flags = _STATUS_FLAGS.get(structured_response.status)
+            if flags:
+                is_task_complete, require_user_input = flags
                 return {
-                    'is_task_complete': True,
-                    'require_user_input': False,
+                    'is_task_complete': is_task_complete,
+                    'require_user_input': require_user_input,
                     'content': structured_response.message,
                 }
 
@@ -0,0 +1,111 @@
+"""
+Shared MCP stdio connections
+
+Spawning an MCP stdio server and running the handshake costs seconds, so
+agents in the same process share one session per server command instead of
+each starting their own subprocess.
+"""
+import asyncio
+
+from mcp import ClientSession
+from mcp.client.stdio import stdio_client, StdioServerParameters
+
+
+class MCPConnectionPool:
+    """Pool of initialized MCP stdio sessions keyed by server command."""
+
+    def __init__(self):
+        self._connections: dict[str, tuple[ClientSession, asyncio.Event, asyncio.Task]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def get(self, key: str, server_params: StdioServerParameters) -> ClientSession:
+        """
+        Return the session for key, starting the server on first use.
+
+        Concurrent callers for the same key wait on a per-key lock and share
+        the subprocess started by the first caller. The session is opened and
+        closed by a dedicated owner task, so get(), release() and aclose() may
+        be awaited from any task.
+        """
+        connection = self._connections.get(key)
+        if connection:
+            return connection[0]
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            connection = self._connections.get(key)
+            if connection:
+                return connection[0]
+
+            ready = asyncio.get_running_loop().create_future()
+            stop = asyncio.Event()
+            owner = asyncio.create_task(
+                self._own_session(key, server_params, ready, stop),
+                name=f"mcp-session:{key}",
+            )
+            try:
+                session = await ready
+            except BaseException:
+                # Startup failed or the caller gave up waiting; the owner
+                # task unwinds the stdio transport in its own cancel scopes
+                owner.cancel()
+                await asyncio.gather(owner, return_exceptions=True)
+                raise
+
+            self._connections[key] = (session, stop, owner)
+            return session
+
+    def session(self, key: str) -> ClientSession | None:
+        """
+        Return the live session for key without starting one.
+
+        None once the owner task has exited (server crash, stdio EOF), so
+        callers holding an older session can tell it is gone.
+        """
+        connection = self._connections.get(key)
+        return connection[0] if connection else None
+
+    async def _own_session(
+        self,
+        key: str,
+        server_params: StdioServerParameters,
+        ready: asyncio.Future,
+        stop: asyncio.Event,
+    ):
+        """Open the stdio session, hand it to get() and hold it until stop is set."""
+        try:
+            async with stdio_client(server_params) as (read_stream, write_stream):
+                async with ClientSession(read_stream, write_stream) as session:
+                    await session.initialize()
+                    ready.set_result(session)
+                    await stop.wait()
+        except asyncio.CancelledError:
+            if not ready.done():
+                ready.cancel()
+            raise
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                print(f"MCP session {key} closed unexpectedly: {str(e)}")
+        finally:
+            connection = self._connections.get(key)
+            if connection and connection[2] is asyncio.current_task():
+                del self._connections[key]
+
+    async def release(self, key: str):
+        """Close the session for key and terminate its server process."""
+        connection = self._connections.pop(key, None)
+        if connection:
+            _, stop, owner = connection
+            stop.set()
+            await owner
+
+    async def aclose(self):
+        """Close every pooled session."""
+        while self._connections:
+            key = next(iter(self._connections))
+            await self.release(key)
+
+
+mcp_pool = MCPConnectionPool()
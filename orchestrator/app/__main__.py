@@ -5,6 +5,7 @@ Orchestrator Agent main application with A2A SDK integration
 import logging
 import os
 import sys
+from contextlib import asynccontextmanager
 
 import click
 import httpx
@@ -12,7 +13,11 @@ import uvicorn
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
 from a2a.server.tasks import InMemoryPushNotifier, InMemoryTaskStore
-from a2a.types import AgentCard, AgentSkill, AgentCapabilities
+from a2a.types import AgentCard, AgentSkill, AgentCapabilities, Task
+from pydantic import ValidationError
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
 
 from app.orchestrator import SmartOrchestrator
 
@@ -79,19 +84,46 @@ def main(host: str, port: int):
         from app.agent_executor import OrchestratorAgentExecutor
         
         agent_card = create_orchestrator_agent_card(host, port)
+        agent_executor = OrchestratorAgentExecutor()
 
         # Create the A2A server
         httpx_client = httpx.AsyncClient()
         request_handler = DefaultRequestHandler(
-            agent_executor=OrchestratorAgentExecutor(),
+            agent_executor=agent_executor,
             task_store=InMemoryTaskStore(),
             push_notifier=InMemoryPushNotifier(httpx_client),
         )
         server = A2AStarletteApplication(
             agent_card=agent_card, http_handler=request_handler
         )
+        orchestrator = agent_executor.orchestrator
 
-        uvicorn.run(server.build(), host=host, port=port)
+        async def push_notification(request: Request) -> Response:
+            # Agents post the task here when a forwarded request's task changes state.
+            # The push id is a per-request secret, so an unknown id is rejected
+            # before the body is read.
+            push_id = request.path_params["push_id"]
+            if not orchestrator.has_pending_push(push_id):
+                return Response(status_code=404)
+            try:
+                task = Task.model_validate_json(await request.body())
+            except ValidationError:
+                return Response(status_code=400)
+            found = orchestrator.handle_push_notification(push_id, task.model_dump(mode="json", exclude_none=True))
+            return Response(status_code=200 if found else 404)
+
+        @asynccontextmanager
+        async def lifespan(app):
+            # Fetch the default agent cards inside the server's event loop
+            await orchestrator.astart(push_callback_url=f"http://{host}:{port}/notify")
+            logger.info("Orchestrator initialized with agents: %s", orchestrator.agents.keys())
+            try:
+                yield
+            finally:
+                await orchestrator.aclose()
+
+        routes = [Route("/notify/{push_id}", push_notification, methods=["POST"])]
+        uvicorn.run(server.build(routes=routes, lifespan=lifespan), host=host, port=port)
 
     except Exception as e:
         logger.error(f'An error occurred during server startup: {e}')
@@ -1,8 +1,11 @@
 """
 Orchestrator Agent Executor
 """
+import asyncio
 import logging
+from typing import Optional
 
+import orjson
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import EventQueue
 from a2a.server.tasks import TaskUpdater
@@ -26,19 +29,33 @@ from app.orchestrator import SmartOrchestrator
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Support four major features:
+
+def _text_artifact(text: str) -> list[Part]:
+    """Build a single text part without re-validating trusted, locally built text"""
+    return [Part.model_construct(root=TextPart.model_construct(text=text))]
+
+
+# Support five major features:
 # 1. List available agents: LIST_AGENTS
 # 2. Register an agent: REGISTER_AGENT:<agent_url>
-# 3. Unregister an agent: UNREGISTER_AGENT:<agent_id>
-# 4. Process a request through the orchestrator: <request>
+# 3. Register several agents concurrently: REGISTER_AGENTS:<agent_url>,<agent_url>,...
+# 4. Unregister an agent: UNREGISTER_AGENT:<agent_id>
+# 5. Process a request through the orchestrator: <request>
 
 class OrchestratorAgentExecutor(AgentExecutor):
     """Orchestrator Agent Executor for intelligent request routing"""
 
     def __init__(self):
         logger.info("Initializing OrchestratorAgentExecutor...")
+        # Default agents are loaded by orchestrator.astart() once the event loop is running
         self.orchestrator = SmartOrchestrator()
-        logger.info(f"Orchestrator initialized with agents: {list(self.orchestrator.agents.keys())}")
+        # Command verb -> handler; anything else is routed through the orchestrator
+        self._handlers = {
+            "LIST_AGENTS": self._handle_list,
+            "REGISTER_AGENT": self._handle_register,
+            "REGISTER_AGENTS": self._handle_register_many,
+            "UNREGISTER_AGENT": self._handle_unregister,
+        }
 
     async def execute(
         self,
@@ -47,11 +64,11 @@ class OrchestratorAgentExecutor(AgentExecutor):
     ) -> None:
         error = self._validate_request(context)
         if error:
-            raise ServerError(error=InvalidParamsError())
+            raise ServerError(error=error)
 
         query = context.get_user_input()
-        logger.info(f"Processing query: {query}")
-        logger.info(f"Available agents: {list(self.orchestrator.agents.keys())}")
+        logger.info("Processing query: %s", query)
+        logger.info("Available agents: %s", self.orchestrator.agents.keys())
         
         task = context.current_task
         if not task:
@@ -63,161 +80,16 @@ class OrchestratorAgentExecutor(AgentExecutor):
         updater = TaskUpdater(event_queue, task.id, task.contextId)
         
         try:
-            # Check if this is a list agents request
-            if query.strip() == "LIST_AGENTS":
-                logger.info("Listing available agents")
-                
-                await updater.update_status(
-                    TaskState.working,
-                    new_agent_text_message(
-                        "Retrieving available agents...",
-                        task.contextId,
-                        task.id,
-                    ),
-                )
-                
-                # Get available agents
-                agents = self.orchestrator.get_available_agents()
-                logger.info(f"Available agents: {len(agents)}")
-                
-                # Format as JSON for the client
-                import json
-                response_text = json.dumps({
-                    "type": "agent_list",
-                    "agents": agents,
-                    "total_count": len(agents)
-                }, indent=2)
-            
-            # Check if this is a registration request
-            elif query.startswith("REGISTER_AGENT:"):
-                endpoint = query.replace("REGISTER_AGENT:", "").strip()
-                logger.info(f"Registering agent from endpoint: {endpoint}")
-                
-                await updater.update_status(
-                    TaskState.working,
-                    new_agent_text_message(
-                        f"Registering agent from {endpoint}...",
-                        task.contextId,
-                        task.id,
-                    ),
-                )
-                
-                # Register the agent
-                result = await self.orchestrator.register_agent(endpoint)
-                logger.info(f"Registration result: {result}")
-                
-                if result.get("success", False):
-                    # Log all registered agent details after successful registration
-                    logger.info("=" * 80)
-                    logger.info("🎉 AGENT REGISTRATION SUCCESSFUL - ALL REGISTERED AGENTS:")
-                    logger.info("=" * 80)
-                    
-                    for agent_id, agent_card in self.orchestrator.agents.items():
-                        logger.info(f"Agent ID: {agent_id}")
-                        logger.info(f"  Name: {agent_card.name}")
-                        logger.info(f"  Endpoint: {agent_card.url}")
-                        logger.info(f"  Description: {agent_card.description}")
-                        
-                        # Log skills if available
-                        if agent_card.skills:
-                            logger.info(f"  Skills ({len(agent_card.skills)}):")
-                            for skill in agent_card.skills:
-                                logger.info(f"    • {skill.name}: {skill.description}")
-                                if skill.tags:
-                                    logger.info(f"      Tags: {', '.join(skill.tags)}")
-                        else:
-                            logger.info("  Skills: None")
-                        
-                        # Log capabilities if available
-                        capabilities = agent_card.capabilities
-                        logger.info(f"  Capabilities:")
-                        logger.info(f"    • Streaming: {capabilities.streaming}")
-                        logger.info(f"    • Push Notifications: {capabilities.pushNotifications}")
-                        logger.info(f"    • State Transition History: {capabilities.stateTransitionHistory}")
-                        
-                        logger.info("-" * 40)
-                    
-                    logger.info(f"Total registered agents: {len(self.orchestrator.agents)}")
-                    logger.info("=" * 80)
-                    
-                    response_text = f"✅ {result.get('message')}\n"
-                    response_text += f"Agent ID: {result.get('agent_id')}\n"
-                    response_text += f"Agent Name: {result.get('agent_name')}\n"
-                    response_text += f"Total agents: {len(self.orchestrator.agents)}"
-                else:
-                    response_text = f"❌ Registration failed: {result.get('error')}"
-            
-            # Check if this is an unregistration request
-            elif query.startswith("UNREGISTER_AGENT:"):
-                agent_identifier = query.replace("UNREGISTER_AGENT:", "").strip()
-                logger.info(f"Unregistering agent: {agent_identifier}")
-                
-                await updater.update_status(
-                    TaskState.working,
-                    new_agent_text_message(
-                        f"Unregistering agent {agent_identifier}...",
-                        task.contextId,
-                        task.id,
-                    ),
-                )
-                
-                # Unregister the agent
-                result = await self.orchestrator.unregister_agent(agent_identifier)
-                logger.info(f"Unregistration result: {result}")
-                
-                if result.get("success", False):
-                    # Log all registered agent details after successful unregistration
-                    logger.info("=" * 80)
-                    logger.info("🗑️  AGENT UNREGISTRATION SUCCESSFUL - REMAINING REGISTERED AGENTS:")
-                    logger.info("=" * 80)
-                    
-                    if self.orchestrator.agents:
-                        for agent_id, agent_card in self.orchestrator.agents.items():
-                            logger.info(f"Agent ID: {agent_id}")
-                            logger.info(f"  Name: {agent_card.name}")
-                            logger.info(f"  Endpoint: {agent_card.url}")
-                            logger.info(f"  Description: {agent_card.description}")
-                            logger.info("-" * 40)
-                    else:
-                        logger.info("No agents remaining in registry")
-                    
-                    logger.info(f"Total remaining agents: {len(self.orchestrator.agents)}")
-                    logger.info("=" * 80)
-                    
-                    response_text = f"✅ {result.get('message')}\n"
-                    response_text += f"Agent ID: {result.get('agent_id')}\n"
-                    response_text += f"Remaining agents: {len(self.orchestrator.agents)}"
-                else:
-                    response_text = f"❌ Unregistration failed: {result.get('error')}"
-                
+            verb, _, payload = query.partition(":")
+            handler = self._handlers.get(verb.strip())
+            if handler:
+                response_text = await handler(payload.strip(), updater, task)
             else:
-                # Process the request through the orchestrator
-                result = await self.orchestrator.process_request(query)
-                logger.info(f"Orchestrator result: {result}")
-                
-                # Update task status
-                await updater.update_status(
-                    TaskState.working,
-                    new_agent_text_message(
-                        "Processing request through orchestrator...",
-                        task.contextId,
-                        task.id,
-                    ),
-                )
-                
-                # Format the response
-                if result.get("success", False):
-                    response_text = f"✅ Routed to {result.get('selected_agent_name', 'Unknown Agent')}\n"
-                    response_text += f"Confidence: {result.get('confidence', 0):.2f}\n"
-                    response_text += f"Reasoning: {result.get('reasoning', 'No reasoning provided')}\n"
-                    response_text += f"Response: {result.get('response', 'No response')}"
-                else:
-                    response_text = f"❌ Error: {result.get('error', 'Unknown error')}"
-                    logger.error(f"Orchestrator error: {result.get('error', 'Unknown error')}")
+                response_text = await self._handle_request(query, updater, task)
             
             # Complete the task
             await updater.add_artifact(
-                [Part(root=TextPart(text=response_text))],
+                _text_artifact(response_text),
                 name='orchestrator_result',
             )
             await updater.complete()
@@ -226,8 +98,160 @@ class OrchestratorAgentExecutor(AgentExecutor):
             logger.error(f'An error occurred while processing orchestrator request: {e}')
             raise ServerError(error=InternalError()) from e
 
-    def _validate_request(self, context: RequestContext) -> bool:
-        return False
+    async def _handle_list(self, payload: str, updater: TaskUpdater, task: Task) -> str:
+        """Handle LIST_AGENTS"""
+        logger.info("Listing available agents")
+        
+        await updater.update_status(
+            TaskState.working,
+            new_agent_text_message(
+                "Retrieving available agents...",
+                task.contextId,
+                task.id,
+            ),
+        )
+        
+        # Get available agents
+        agents = self.orchestrator.get_available_agents()
+        logger.info(f"Available agents: {len(agents)}")
+        
+        # Format as compact JSON for the client
+        return orjson.dumps({
+            "type": "agent_list",
+            "agents": agents,
+            "total_count": len(agents)
+        }).decode()
+
+    async def _handle_register(self, endpoint: str, updater: TaskUpdater, task: Task) -> str:
+        """Handle REGISTER_AGENT:<agent_url>"""
+        logger.info(f"Registering agent from endpoint: {endpoint}")
+        
+        await updater.update_status(
+            TaskState.working,
+            new_agent_text_message(
+                f"Registering agent from {endpoint}...",
+                task.contextId,
+                task.id,
+            ),
+        )
+        
+        # Register the agent
+        result = await self.orchestrator.register_agent(endpoint)
+        logger.info(f"Registration result: {result}")
+        
+        if not result.get("success", False):
+            return f"❌ Registration failed: {result.get('error')}"
+
+        self._log_registry_change("register", result.get("agent_id"))
+        
+        response_text = f"✅ {result.get('message')}\n"
+        response_text += f"Agent ID: {result.get('agent_id')}\n"
+        response_text += f"Agent Name: {result.get('agent_name')}\n"
+        response_text += f"Total agents: {len(self.orchestrator.agents)}"
+        return response_text
+
+    async def _handle_register_many(self, payload: str, updater: TaskUpdater, task: Task) -> str:
+        """Handle REGISTER_AGENTS:<agent_url>,<agent_url>,..."""
+        endpoints = [endpoint.strip() for endpoint in payload.split(",") if endpoint.strip()]
+        logger.info("Registering %d agents: %s", len(endpoints), endpoints)
+        
+        await updater.update_status(
+            TaskState.working,
+            new_agent_text_message(
+                f"Registering {len(endpoints)} agents...",
+                task.contextId,
+                task.id,
+            ),
+        )
+        
+        # Fetch all agent cards concurrently
+        results = await asyncio.gather(
+            *[self.orchestrator.register_agent(endpoint) for endpoint in endpoints],
+            return_exceptions=True,
+        )
+        
+        lines = []
+        succeeded = 0
+        for endpoint, result in zip(endpoints, results):
+            if isinstance(result, Exception):
+                lines.append(f"❌ {endpoint}: {result}")
+            elif result.get("success", False):
+                succeeded += 1
+                lines.append(f"✅ {endpoint}: {result.get('agent_name')}")
+            else:
+                lines.append(f"❌ {endpoint}: {result.get('error')}")
+        logger.info("Registered %d/%d agents", succeeded, len(endpoints))
+        
+        lines.append(f"Registered {succeeded}/{len(endpoints)} agents")
+        lines.append(f"Total agents: {len(self.orchestrator.agents)}")
+        return "\n".join(lines)
+
+    async def _handle_unregister(self, agent_identifier: str, updater: TaskUpdater, task: Task) -> str:
+        """Handle UNREGISTER_AGENT:<agent_id>"""
+        logger.info(f"Unregistering agent: {agent_identifier}")
+        
+        await updater.update_status(
+            TaskState.working,
+            new_agent_text_message(
+                f"Unregistering agent {agent_identifier}...",
+                task.contextId,
+                task.id,
+            ),
+        )
+        
+        # Unregister the agent
+        result = await self.orchestrator.unregister_agent(agent_identifier)
+        logger.info(f"Unregistration result: {result}")
+        
+        if not result.get("success", False):
+            return f"❌ Unregistration failed: {result.get('error')}"
+
+        self._log_registry_change("unregister", result.get("agent_id"))
+        
+        response_text = f"✅ {result.get('message')}\n"
+        response_text += f"Agent ID: {result.get('agent_id')}\n"
+        response_text += f"Remaining agents: {len(self.orchestrator.agents)}"
+        return response_text
+
+    async def _handle_request(self, query: str, updater: TaskUpdater, task: Task) -> str:
+        """Process a request through the orchestrator"""
+        result = await self.orchestrator.process_request(query)
+        logger.info(f"Orchestrator result: {result}")
+        
+        # Update task status
+        await updater.update_status(
+            TaskState.working,
+            new_agent_text_message(
+                "Processing request through orchestrator...",
+                task.contextId,
+                task.id,
+            ),
+        )
+        
+        # Format the response
+        if result.get("success", False):
+            response_text = f"✅ Routed to {result.get('selected_agent_name', 'Unknown Agent')}\n"
+            response_text += f"Confidence: {result.get('confidence', 0):.2f}\n"
+            response_text += f"Reasoning: {result.get('reasoning', 'No reasoning provided')}\n"
+            response_text += f"Response: {result.get('response', 'No response')}"
+        else:
+            response_text = f"❌ Error: {result.get('error', 'Unknown error')}"
+            logger.error(f"Orchestrator error: {result.get('error', 'Unknown error')}")
+        return response_text
+
+    def _log_registry_change(self, op: str, agent_id: str):
+        """Log one summary line per registry change; the full registry only at DEBUG"""
+        logger.info("registry changed op=%s agent=%s total=%d", op, agent_id, len(self.orchestrator.agents))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "registry contents: %s",
+                {aid: agent_card.url for aid, agent_card in self.orchestrator.agents.items()},
+            )
+
+    def _validate_request(self, context: RequestContext) -> Optional[InvalidParamsError]:
+        if not context.get_user_input().strip():
+            return InvalidParamsError(message="Request must contain a non-empty text message")
+        return None
 
     async def cancel(
         self, request: RequestContext, event_queue: EventQueue
@@ -3,60 +3,189 @@
 Smart Orchestrator Agent with A2A SDK integration
 """
 import asyncio
+import logging
+import re
+import secrets
+import time
 import uuid
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, TypedDict
+from typing import Dict, List, Optional, Tuple
 
+import ahocorasick
 import httpx
+import orjson
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph
 from a2a.types import AgentCard, AgentSkill, AgentCapabilities
 from a2a.client import A2AClient, A2ACardResolver
 
-class RouterState(TypedDict):
-    request: str
-    selected_agent: str
-    confidence: float
-    reasoning: str
-    response: str
-    error: str
-    metadata: dict
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+@dataclass(slots=True)
+class RouterState:
+    request: str = ""
+    selected_agent: str = ""
+    confidence: float = 0.0
+    reasoning: str = ""
+    response: str = ""
+    error: str = ""
+    metadata: dict = field(default_factory=dict)
+
+
+# Workflow nodes look up the orchestrator from the run config, so one compiled
+# graph can be shared by every SmartOrchestrator instance
+async def _analyze_node(state: RouterState, config: RunnableConfig) -> Dict:
+    return await config["configurable"]["orchestrator"]._analyze_request(state)
+
+
+async def _route_node(state: RouterState, config: RunnableConfig) -> Dict:
+    return await config["configurable"]["orchestrator"]._route_to_agent(state)
+
+
+# Default agent endpoints loaded on startup
+DEFAULT_AGENTS = [
+    "http://localhost:8001",
+    "http://localhost:8002",
+    "http://localhost:8003"
+]
+
+# Constant parts of forwarded A2A JSON-RPC requests, shared rather than rebuilt per call
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_SSE_HEADERS = {"Content-Type": "application/json", "Accept": "text/event-stream"}
+_TEXT_OUTPUT_MODES = ["text"]
+
+# Maximum number of agent cards fetched at once
+CARD_FETCH_CONCURRENCY = 8
+
+# Forwarded answers kept per (agent, normalized query), and for how long
+RESPONSE_CACHE_SIZE = 1024
+RESPONSE_CACHE_TTL_SECONDS = 60.0
+
+# Words that mark a request as changing state; such requests are never answered from the cache
+_MUTATING_WORDS = frozenset({
+    "sync", "create", "delete", "remove", "deploy", "redeploy", "rollback",
+    "restart", "update", "upgrade", "apply", "scale", "set", "patch", "install",
+    "uninstall", "terminate", "refresh", "register", "unregister", "add", "run",
+})
+_WORD_RE = re.compile(r"[a-z]+")
+
+
+def _is_read_only(request_lower: str) -> bool:
+    """Whether a lowercased request contains no state-changing verb"""
+    return _MUTATING_WORDS.isdisjoint(_WORD_RE.findall(request_lower))
+
+
+class _AgentAnswer(str):
+    """Text an agent returned as its completed answer, as opposed to a status or timeout notice"""
+    __slots__ = ()
+
+
+# Metadata timestamps kept as epoch nanoseconds until a result is returned
+_TIMESTAMP_KEYS = ("start_timestamp", "analysis_timestamp", "response_timestamp", "error_timestamp")
+
+
+def _render_metadata(metadata: Dict) -> Dict:
+    """Copy metadata with its nanosecond timestamps rendered as ISO strings"""
+    rendered = dict(metadata)
+    for key in _TIMESTAMP_KEYS:
+        if key in rendered:
+            rendered[key] = datetime.fromtimestamp(rendered[key] / 1e9).isoformat()
+    return rendered
 
 
 class SmartOrchestrator:
     """Intelligent orchestrator using A2A SDK types and LangGraph workflow"""
     
+    _compiled_workflow = None
+    
     def __init__(self):
         self.agents: Dict[str, AgentCard] = {}
         self.skill_keywords: Dict[str, List[str]] = {}
+        # keyword -> keyword id; the id indexes ({agent_id: summed tag weight}, [(agent_id, skill_name)])
+        self._keyword_ids: Dict[str, int] = {}
+        self._keyword_entries: List[Tuple[Dict[str, float], List[Tuple[str, str]]]] = []
+        # agent_id -> [(tag as written on the card, keyword id)] in card order
+        self._agent_tag_ids: Dict[str, List[Tuple[str, int]]] = {}
+        # agent_id -> skill tags / skill names in card order, rebuilt only when agents change
+        self._agent_keywords: Dict[str, List[str]] = {}
+        self._agent_skill_names: Dict[str, List[str]] = {}
+        # Card URL / lowercased card name -> agent_id, for unregister lookups
+        self._by_url: Dict[str, str] = {}
+        self._by_name_lower: Dict[str, str] = {}
+        self._automaton: Optional[ahocorasick.Automaton] = None
+        # Agent used when no keyword or skill matches the request
+        self._default_agent_id: Optional[str] = None
+        # Shared across card fetches and forwarded requests; created lazily
+        # so construction does no I/O and works inside a running event loop
+        self._httpx: Optional[httpx.AsyncClient] = None
+        # Base URL agents post push notifications to, and the forwarded
+        # requests waiting on them keyed by the id appended to that URL; the
+        # id is an unguessable per-request secret, so the URL authenticates the push
+        self._push_callback_url: Optional[str] = None
+        self._pending_pushes: Dict[str, asyncio.Future] = {}
+        # (agent_id, normalized read-only query) -> (monotonic expiry, answer), in LRU order
+        self._answer_cache: "OrderedDict[Tuple[str, str], Tuple[float, str]]" = OrderedDict()
         self.workflow = self._create_workflow()
-        self._initialize_default_agents()
     
-    def _initialize_default_agents(self):
-        """Initialize default agents by fetching their agent cards using A2A client"""
-        
-        # Default agent endpoints
-        default_agents = [
-            "http://localhost:8001",
-            "http://localhost:8002",
-            "http://localhost:8003"
-        ]
+    @classmethod
+    async def create(cls, push_callback_url: Optional[str] = None) -> "SmartOrchestrator":
+        """Create an orchestrator with the default agents loaded"""
+        self = cls()
+        await self.astart(push_callback_url)
+        return self
+    
+    async def astart(self, push_callback_url: Optional[str] = None):
+        """
+        Initialize default agents by fetching their agent cards using A2A client.
         
-        # Fetch agent cards using A2A client - run async initialization
-        asyncio.run(self._fetch_all_agent_cards(default_agents))
+        When push_callback_url is given, agents advertising push notifications
+        report task completion to <push_callback_url>/<id> instead of being polled.
+        """
+        self._push_callback_url = push_callback_url.rstrip("/") if push_callback_url else None
+        await self._fetch_all_agent_cards(DEFAULT_AGENTS)
+    
+    async def aclose(self):
+        """Close the shared HTTP client"""
+        if self._httpx is not None:
+            await self._httpx.aclose()
+            self._httpx = None
+    
+    def _http_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use"""
+        if self._httpx is None:
+            # HTTP/2 and keepalive let polls and fan-out to the same agent share connections
+            self._httpx = httpx.AsyncClient(
+                http2=True,
+                timeout=5.0,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            )
+        return self._httpx
     
     async def _fetch_all_agent_cards(self, default_agents: List[str]):
-        """Async method to fetch all agent cards"""
-        async with httpx.AsyncClient(timeout=5.0) as httpx_client:
-            for endpoint in default_agents:
-                try:
-                    agent_card = await self._fetch_agent_card_with_a2a(httpx_client, endpoint)
-                    if agent_card:
-                        self.agents[agent_card.name] = agent_card
-                        print(f"✅ Loaded {agent_card.name} from {endpoint}")
-                    else:
-                        print(f"⚠️  Failed to load agent card from {endpoint}")
-                except Exception as e:
-                    print(f"❌ Error loading agent from {endpoint}: {e}")
+        """Async method to fetch all agent cards concurrently"""
+        httpx_client = self._http_client()
+        semaphore = asyncio.Semaphore(CARD_FETCH_CONCURRENCY)
+        
+        async def fetch(endpoint: str) -> Optional[AgentCard]:
+            async with semaphore:
+                return await self._fetch_agent_card_with_a2a(httpx_client, endpoint)
+        
+        results = await asyncio.gather(
+            *[fetch(endpoint) for endpoint in default_agents],
+            return_exceptions=True
+        )
+        for endpoint, agent_card in zip(default_agents, results):
+            if isinstance(agent_card, Exception):
+                logger.error("Error loading agent from %s: %s", endpoint, agent_card)
+            elif agent_card:
+                self.agents[agent_card.name] = agent_card
+                logger.info("Loaded %s from %s", agent_card.name, endpoint)
+            else:
+                logger.warning("Failed to load agent card from %s", endpoint)
         
         # Update skill keywords after loading all default agents
         self._update_skill_keywords()
@@ -75,7 +204,7 @@ class SmartOrchestrator:
             return agent_card
                 
         except Exception as e:
-            print(f"Error fetching agent card from {endpoint} using A2A client: {e}")
+            logger.warning("Error fetching agent card from %s using A2A client: %s", endpoint, e)
             return None
     
     def add_agent(self, agent_id: str, agent_card: AgentCard):
@@ -84,8 +213,15 @@ class SmartOrchestrator:
         self._update_skill_keywords()
     
     def _update_skill_keywords(self):
-        """Update skill keywords based on currently available agents"""
+        """
+        Update skill keywords based on currently available agents.
+        
+        Every keyword is lowercased once here, so scoring a request only has to
+        lowercase the request itself.
+        """
         self.skill_keywords = {}
+        # Lowercased keywords already added per skill, for O(1) dedup
+        seen_keywords: Dict[str, set] = {}
         
         for agent_id, agent_card in self.agents.items():
             for skill in agent_card.skills:
@@ -94,53 +230,108 @@ class SmartOrchestrator:
                 # Initialize skill keywords list if not exists
                 if skill_name not in self.skill_keywords:
                     self.skill_keywords[skill_name] = []
+                    seen_keywords[skill_name] = set()
+                keywords = self.skill_keywords[skill_name]
+                seen = seen_keywords[skill_name]
                 
                 # Add tags from this skill as keywords
                 if skill.tags:
                     for tag in skill.tags:
-                        if tag.lower() not in [kw.lower() for kw in self.skill_keywords[skill_name]]:
-                            self.skill_keywords[skill_name].append(tag.lower())
+                        tag_lower = tag.lower()
+                        if tag_lower not in seen:
+                            seen.add(tag_lower)
+                            keywords.append(tag_lower)
                 
                 # Add skill name itself as a keyword
                 skill_name_lower = skill_name.lower().replace("_", " ")
-                if skill_name_lower not in [kw.lower() for kw in self.skill_keywords[skill_name]]:
-                    self.skill_keywords[skill_name].append(skill_name_lower)
+                if skill_name_lower not in seen:
+                    seen.add(skill_name_lower)
+                    keywords.append(skill_name_lower)
                 
                 # Add description words as keywords (first 3 words)
                 if skill.description:
                     desc_words = skill.description.lower().split()[:3]
                     for word in desc_words:
                         # Only add meaningful words (length > 2)
-                        if len(word) > 2 and word not in [kw.lower() for kw in self.skill_keywords[skill_name]]:
-                            self.skill_keywords[skill_name].append(word)
+                        if len(word) > 2 and word not in seen:
+                            seen.add(word)
+                            keywords.append(word)
+        
+        # Build one automaton over every tag and skill keyword so a request is
+        # scored for all agents in a single pass. Tag weights are folded per
+        # agent up front, so each hit costs one add per owning agent.
+        keyword_index = defaultdict(lambda: (defaultdict(float), []))
+        for agent_id, agent_card in self.agents.items():
+            for skill in agent_card.skills:
+                for tag in (skill.tags or []):
+                    keyword_index[tag.lower()][0][agent_id] += 1.0
+                for keyword in self.skill_keywords.get(skill.name, []):
+                    keyword_index[keyword][1].append((agent_id, skill.name))
+        self._keyword_ids = {keyword: keyword_id for keyword_id, keyword in enumerate(keyword_index)}
+        self._keyword_entries = [
+            (dict(tag_weights), skill_refs) for tag_weights, skill_refs in keyword_index.values()
+        ]
+        self._agent_keywords = {
+            agent_id: [tag for skill in agent_card.skills for tag in (skill.tags or [])]
+            for agent_id, agent_card in self.agents.items()
+        }
+        self._agent_skill_names = {
+            agent_id: [skill.name for skill in agent_card.skills]
+            for agent_id, agent_card in self.agents.items()
+        }
+        self._agent_tag_ids = {
+            agent_id: [(tag, self._keyword_ids[tag.lower()]) for tag in tags]
+            for agent_id, tags in self._agent_keywords.items()
+        }
+        
+        if self._keyword_ids:
+            # The automaton yields integer keyword ids, so hits index straight into the entry table
+            automaton = ahocorasick.Automaton()
+            for keyword, keyword_id in self._keyword_ids.items():
+                automaton.add_word(keyword, keyword_id)
+            automaton.make_automaton()
+            self._automaton = automaton
+        else:
+            self._automaton = None
+        
+        self._by_url = {agent_card.url: agent_id for agent_id, agent_card in self.agents.items()}
+        self._by_name_lower = {agent_card.name.lower(): agent_id for agent_id, agent_card in self.agents.items()}
+        
+        # Fall back to the ArgoCD agent when registered, otherwise the first agent
+        self._default_agent_id = next(
+            (agent_id for agent_id in self.agents if "argocd" in agent_id.lower()),
+            next(iter(self.agents), None)
+        )
         
-        print(f"Updated skill keywords for {len(self.skill_keywords)} skills from {len(self.agents)} agents")
+        # Cached answers belong to the previous agent set
+        self._answer_cache.clear()
+        
+        logger.info("Updated skill keywords for %d skills from %d agents", len(self.skill_keywords), len(self.agents))
     
     async def register_agent(self, endpoint: str) -> Dict:
         """Register a new agent by fetching its agent card from the endpoint"""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as httpx_client:
-                agent_card = await self._fetch_agent_card_with_a2a(httpx_client, endpoint)
-                if agent_card:
-                    # Generate agent_id from the endpoint
-                    agent_id = agent_card.name
-                    
-                    # Add the agent to our registry
-                    self.agents[agent_id] = agent_card
-                    self._update_skill_keywords()
-                    
-                    return {
-                        "success": True,
-                        "agent_id": agent_id,
-                        "agent_name": agent_card.name,
-                        "endpoint": endpoint,
-                        "message": f"Successfully registered {agent_card.name} from {endpoint}"
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "error": f"Failed to fetch agent card from {endpoint}"
-                    }
+            agent_card = await self._fetch_agent_card_with_a2a(self._http_client(), endpoint)
+            if agent_card:
+                # Generate agent_id from the endpoint
+                agent_id = agent_card.name
+                
+                # Add the agent to our registry
+                self.agents[agent_id] = agent_card
+                self._update_skill_keywords()
+                
+                return {
+                    "success": True,
+                    "agent_id": agent_id,
+                    "agent_name": agent_card.name,
+                    "endpoint": endpoint,
+                    "message": f"Successfully registered {agent_card.name} from {endpoint}"
+                }
+            else:
+                return {
+                    "success": False,
+                    "error": f"Failed to fetch agent card from {endpoint}"
+                }
         except Exception as e:
             return {
                 "success": False,
@@ -150,31 +341,21 @@ class SmartOrchestrator:
     async def unregister_agent(self, agent_identifier: str) -> Dict:
         """Unregister an agent by agent_id, endpoint, or name"""
         try:
-            agent_to_remove = None
-            agent_id_to_remove = None
+            # Match by agent_id, then endpoint/URL, then name
+            agent_id_to_remove = (
+                agent_identifier if agent_identifier in self.agents
+                else self._by_url.get(agent_identifier)
+                or self._by_name_lower.get(agent_identifier.lower())
+            )
+            
+            # Match by partial endpoint (e.g., localhost:8080)
+            if agent_id_to_remove is None:
+                agent_id_to_remove = next(
+                    (agent_id for agent_id, agent_card in self.agents.items() if agent_identifier in agent_card.url),
+                    None
+                )
             
-            # Try to find the agent by different identifiers
-            for agent_id, agent_card in self.agents.items():
-                # Match by agent_id
-                if agent_id == agent_identifier:
-                    agent_to_remove = agent_card
-                    agent_id_to_remove = agent_id
-                    break
-                # Match by endpoint/URL
-                elif agent_card.url == agent_identifier:
-                    agent_to_remove = agent_card
-                    agent_id_to_remove = agent_id
-                    break
-                # Match by name
-                elif agent_card.name.lower() == agent_identifier.lower():
-                    agent_to_remove = agent_card
-                    agent_id_to_remove = agent_id
-                    break
-                # Match by partial endpoint (e.g., localhost:8080)
-                elif agent_identifier in agent_card.url:
-                    agent_to_remove = agent_card
-                    agent_id_to_remove = agent_id
-                    break
+            agent_to_remove = self.agents.get(agent_id_to_remove) if agent_id_to_remove else None
             
             if agent_to_remove and agent_id_to_remove:
                 # Remove the agent from registry
@@ -210,7 +391,7 @@ class SmartOrchestrator:
                 "description": agent_card.description,
                 "endpoint": agent_card.url,
                 "skills": [{"name": skill.name, "description": skill.description} for skill in agent_card.skills],
-                "keywords": [tag for skill in agent_card.skills for tag in (skill.tags or [])],
+                "keywords": list(self._agent_keywords.get(agent_id, [])),
                 "capabilities": [cap for cap, enabled in [
                     ("streaming", agent_card.capabilities.streaming),
                     ("pushNotifications", agent_card.capabilities.pushNotifications),
@@ -219,70 +400,74 @@ class SmartOrchestrator:
             })
         return agents
     
-    def _create_workflow(self):
-        """Create LangGraph workflow for request routing"""
-        workflow = StateGraph(RouterState)
-        
-        workflow.add_node("analyze", self._analyze_request)
-        workflow.add_node("route", self._route_to_agent)
-        
-        workflow.add_edge("analyze", "route")
-        workflow.set_entry_point("analyze")
-        workflow.set_finish_point("route")
-        
-        return workflow.compile()
+    @classmethod
+    def _create_workflow(cls):
+        """Create LangGraph workflow for request routing, compiled once per class"""
+        if cls._compiled_workflow is None:
+            workflow = StateGraph(RouterState)
+            
+            workflow.add_node("analyze", _analyze_node)
+            workflow.add_node("route", _route_node)
+            
+            workflow.add_edge("analyze", "route")
+            workflow.set_entry_point("analyze")
+            workflow.set_finish_point("route")
+            
+            cls._compiled_workflow = workflow.compile()
+        return cls._compiled_workflow
     
-    async def _analyze_request(self, state: RouterState) -> RouterState:
+    async def _analyze_request(self, state: RouterState) -> Dict:
         """Analyze the request and select the best agent"""
-        request = state["request"]
+        request = state.request
         
         best_agent = None
         best_score = 0.0
-        agent_scores = {}
-        skill_matches = {}
+        agent_scores, skill_matches, keyword_matches = self._score_request(request.lower())
         
-        for agent_id, agent_card in self.agents.items():
-            score, matched_skills = self._calculate_agent_score(request, agent_card)
-            agent_scores[agent_id] = score
-            skill_matches[agent_id] = matched_skills
-            
+        for agent_id, score in agent_scores.items():
             if score > best_score:
                 best_score = score
                 best_agent = agent_id
         
-        # Default to argocd if no clear winner
+        # Fall back to the default agent (ArgoCD when registered) if no clear winner;
+        # a score of 0.0 means no agent matched
+        best_agent = best_agent or self._default_agent_id
+        best_score = best_score or 0.3
         if best_agent is None:
-            best_agent = "argocd"
-            best_score = 0.3
+            raise ValueError("No agents available to route the request")
         
         # Calculate confidence (0.0 to 1.0)
-        confidence = min(best_score / 5.0, 1.0)
+        confidence = 1.0 if best_score >= 5.0 else best_score * 0.2
         
         # Generate reasoning
-        reasoning = self._generate_reasoning(request, best_agent, agent_scores, skill_matches)
+        reasoning = self._generate_reasoning(best_agent, keyword_matches, skill_matches)
         
-        state.update({
+        # Timestamps are epoch nanoseconds; process_request renders them as ISO strings
+        return {
             "selected_agent": best_agent,
             "confidence": confidence,
             "reasoning": reasoning,
             "metadata": {
-                "request_id": str(uuid.uuid4()),
-                "start_timestamp": datetime.now().isoformat(),
+                "request_id": uuid.uuid4().hex,
+                "start_timestamp": time.time_ns(),
                 "agent_scores": agent_scores,
                 "skill_matches": skill_matches,
-                "analysis_timestamp": datetime.now().isoformat()
+                "keyword_matches": keyword_matches,
+                "analysis_timestamp": time.time_ns()
             }
-        })
-        
-        return state
+        }
     
-    def _calculate_agent_score(self, request: str, agent_card: AgentCard) -> tuple[float, List[str]]:
+    def _score_request(self, request_lower: str) -> Tuple[Dict[str, float], Dict[str, List[str]], Dict[str, List[str]]]:
         """
-        Calculate score for an agent based on keywords and skills matching.
+        Calculate scores for every agent based on keywords and skills matching.
+        
+        The request is scanned once with the Aho-Corasick automaton built in
+        _update_skill_keywords; each keyword found contributes to every agent
+        that owns it.
         
         Scoring mechanism:
         - Keyword matching from skill tags: +1.0 points per match
-        - Skill matching via _skill_matches_request: +1.5 points per match
+        - Skill matching via skill keywords: +1.5 points per matched skill
         
         Examples:
         
@@ -314,49 +499,42 @@ class SmartOrchestrator:
             → ArgoCD Agent selected (highest score)
         
         Returns:
-            tuple[float, List[str]]: (total_score, list_of_matched_skill_names)
+            tuple[Dict[str, float], Dict[str, List[str]], Dict[str, List[str]]]:
+            (agent_id -> total_score, agent_id -> list_of_matched_skill_names,
+            agent_id -> list_of_matched_tag_keywords)
         """
-        score = 0.0
-        matched_skills = []
-        
-        request_lower = request.lower()
-        
-                # Keyword matching from skill tags (weight: 1.0)
-        keywords = [tag for skill in agent_card.skills for tag in (skill.tags or [])]
-        for keyword in keywords:
-            if keyword.lower() in request_lower:
-                score += 1.0
-
-        # Skill matching (weight: 1.5 - no confidence field available)
-        for skill in agent_card.skills:
-            if self._skill_matches_request(skill.name, request):
-                score += 1.5
-                matched_skills.append(skill.name)
-        
-        return score, matched_skills
-    
-    def _skill_matches_request(self, skill_name: str, request: str) -> bool:
-        """Check if a skill matches the request content using dynamic keywords from available agents"""
-        # Get keywords for this skill from the dynamically built skill_keywords
-        keywords = self.skill_keywords.get(skill_name, [])
-        request_lower = request.lower()
+        agent_scores = dict.fromkeys(self.agents, 0.0)
+        matched = {agent_id: set() for agent_id in self.agents}
+        hits = set()
+        
+        if self._automaton is not None:
+            hits = {keyword_id for _, keyword_id in self._automaton.iter(request_lower)}
+            for keyword_id in hits:
+                tag_weights, skill_refs = self._keyword_entries[keyword_id]
+                # Keyword matching from skill tags (weight: 1.0 per tag)
+                for agent_id, weight in tag_weights.items():
+                    agent_scores[agent_id] += weight
+                for agent_id, skill_name in skill_refs:
+                    matched[agent_id].add(skill_name)
+            
+            # Skill matching (weight: 1.5 - no confidence field available)
+            for agent_id, skill_names in matched.items():
+                agent_scores[agent_id] += 1.5 * len(skill_names)
         
-        return any(keyword in request_lower for keyword in keywords)
+        # Report matched skills and tags in the order the agent card lists them
+        skill_matches = {}
+        keyword_matches = {}
+        for agent_id in self.agents:
+            skill_matches[agent_id] = [name for name in self._agent_skill_names[agent_id] if name in matched[agent_id]]
+            keyword_matches[agent_id] = [tag for tag, keyword_id in self._agent_tag_ids[agent_id] if keyword_id in hits]
+        return agent_scores, skill_matches, keyword_matches
     
-    def _generate_reasoning(self, request: str, selected_agent: str, agent_scores: Dict, skill_matches: Dict) -> str:
+    def _generate_reasoning(self, selected_agent: str, keyword_matches: Dict, skill_matches: Dict) -> str:
         """Generate human-readable reasoning for the routing decision"""
         agent_card = self.agents[selected_agent]
         
-                # Find matched keywords from skill tags
-        matched_keywords = []
-        request_lower = request.lower()
-        keywords = [tag for skill in agent_card.skills for tag in (skill.tags or [])]
-
-        for keyword in keywords:
-            if keyword.lower() in request_lower:
-                matched_keywords.append(keyword)
-        
-        # Get matched skills
+        # Get keywords matched from skill tags and matched skills, both found while scoring
+        matched_keywords = keyword_matches.get(selected_agent, [])
         matched_skills = skill_matches.get(selected_agent, [])
         
         reasoning_parts = [f"Selected {agent_card.name}"]
@@ -371,53 +549,81 @@ class SmartOrchestrator:
                 reasoning_parts.append(f"based on skills: {', '.join(matched_skills)}")
         
         if not matched_keywords and not matched_skills:
-            reasoning_parts.append("using default ArgoCD agent")
+            reasoning_parts.append("as the default agent since no keywords or skills matched")
         
         return " ".join(reasoning_parts)
     
-    async def _route_to_agent(self, state: RouterState) -> RouterState:
+    async def _route_to_agent(self, state: RouterState) -> Dict:
         """Route the request to the selected agent"""
-        selected_agent = state["selected_agent"]
-        request = state["request"]
+        selected_agent = state.selected_agent
+        request = state.request
+        metadata = state.metadata
         
         agent_card = self.agents[selected_agent]
         endpoint = agent_card.url
         
-        state["metadata"]["agent_endpoint"] = endpoint
+        metadata["agent_endpoint"] = endpoint
+        
+        # Only read-only queries may be answered from the cache
+        query = " ".join(request.lower().split())
+        cache_key = (selected_agent, query) if _is_read_only(query) else None
         
         try:
-            # Forward the request to the selected agent and get the actual response
-            actual_response = await self._forward_request_to_agent(endpoint, request)
-            state["response"] = f"🎯 Routed to {agent_card.name} → {actual_response}"
-            state["metadata"]["status"] = "completed"
+            actual_response = self._cached_answer(cache_key) if cache_key else None
+            metadata["cache_hit"] = actual_response is not None
+            if actual_response is None:
+                # Forward the request to the selected agent and get the actual response
+                actual_response = await self._forward_request_to_agent(agent_card, request)
+                if cache_key and isinstance(actual_response, _AgentAnswer):
+                    self._cache_answer(cache_key, actual_response)
+            response = f"🎯 Routed to {agent_card.name} → {actual_response}"
+            metadata["status"] = "completed"
         except Exception as e:
             # Fallback to routing information if forwarding fails
-            state["response"] = f"🎯 Smart Routing Decision\n\n"
-            state["response"] += f"✅ Selected Agent: {agent_card.name}\n"
-            state["response"] += f"🔗 Endpoint: {endpoint}\n"
-            state["response"] += f"📊 Confidence: {state.get('confidence', 0):.2f}\n"
-            state["response"] += f"🧠 Reasoning: {state.get('reasoning', 'No reasoning provided')}\n\n"
-            state["response"] += f"⚠️ Could not forward request: {str(e)}\n"
-            state["response"] += f"💡 Connect directly to {agent_card.name} at {endpoint}"
-            state["metadata"]["status"] = "routing_only"
-        
-        state["metadata"]["response_timestamp"] = datetime.now().isoformat()
-        
-        return state
+            response = f"🎯 Smart Routing Decision\n\n"
+            response += f"✅ Selected Agent: {agent_card.name}\n"
+            response += f"🔗 Endpoint: {endpoint}\n"
+            response += f"📊 Confidence: {state.confidence:.2f}\n"
+            response += f"🧠 Reasoning: {state.reasoning or 'No reasoning provided'}\n\n"
+            response += f"⚠️ Could not forward request: {str(e)}\n"
+            response += f"💡 Connect directly to {agent_card.name} at {endpoint}"
+            metadata["status"] = "routing_only"
+        
+        metadata["response_timestamp"] = time.time_ns()
+        
+        return {"response": response, "metadata": metadata}
+    
+    def _cached_answer(self, cache_key: Tuple[str, str]) -> Optional[str]:
+        """Return the unexpired cached answer for cache_key, or None"""
+        entry = self._answer_cache.get(cache_key)
+        if entry is None:
+            return None
+        expires, answer = entry
+        if expires <= time.monotonic():
+            del self._answer_cache[cache_key]
+            return None
+        self._answer_cache.move_to_end(cache_key)
+        return answer
     
-    async def _forward_request_to_agent(self, endpoint: str, request: str) -> str:
+    def _cache_answer(self, cache_key: Tuple[str, str], answer: str):
+        """Store an agent's completed answer, evicting the least recently used entry when full"""
+        self._answer_cache[cache_key] = (time.monotonic() + RESPONSE_CACHE_TTL_SECONDS, answer)
+        self._answer_cache.move_to_end(cache_key)
+        if len(self._answer_cache) > RESPONSE_CACHE_SIZE:
+            self._answer_cache.popitem(last=False)
+    
+    async def _forward_request_to_agent(self, agent_card: AgentCard, request: str) -> str:
         """Forward request to agent using A2A protocol"""
-        import json
-        from uuid import uuid4
+        endpoint = agent_card.url
         
         # Create A2A JSON-RPC request payload using message/send method
-        task_id = str(uuid4())
-        message_id = str(uuid4())
-        context_id = str(uuid4())
+        task_id = uuid.uuid4().hex
+        message_id = uuid.uuid4().hex
+        context_id = uuid.uuid4().hex
         
         payload = {
             "jsonrpc": "2.0",
-            "id": str(uuid4()),
+            "id": uuid.uuid4().hex,
             "method": "message/send",
             "params": {
                 "id": task_id,
@@ -433,120 +639,221 @@ class SmartOrchestrator:
                     ]
                 },
                 "configuration": {
-                    "acceptedOutputModes": ["text"]
+                    "acceptedOutputModes": _TEXT_OUTPUT_MODES
                 }
             }
         }
         
+        # Let the agent call back when the task finishes instead of polling it
+        push_id = None
+        if (
+            self._push_callback_url
+            and agent_card.capabilities.pushNotifications
+            and not agent_card.capabilities.streaming
+        ):
+            push_id = secrets.token_urlsafe(32)
+            self._pending_pushes[push_id] = asyncio.get_running_loop().create_future()
+            payload["params"]["configuration"]["pushNotificationConfig"] = {
+                "url": f"{self._push_callback_url}/{push_id}",
+                "token": push_id
+            }
+        
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                # Send task to agent
-                response = await client.post(
-                    endpoint,
-                    json=payload,
-                    headers={"Content-Type": "application/json"}
-                )
-                response.raise_for_status()
-                
-                result = response.json()
-                
-                # Check for JSON-RPC error
-                if "error" in result:
-                    raise Exception(f"Agent returned error: {result['error']}")
-                
-                # Get the response from message/send
-                if "result" not in result:
-                    raise Exception("No result in agent response")
-                
-                message_result = result["result"]
-                
-                # For message/send, the response might be a Task or Message
-                if isinstance(message_result, dict):
-                    # If it's a Task, we need to poll for completion
-                    if "id" in message_result and "status" in message_result:
-                        task_id = message_result["id"]
+            client = self._http_client()
+            
+            # Prefer streaming so the result arrives as soon as the task finishes
+            if agent_card.capabilities.streaming:
+                payload["method"] = "message/stream"
+                return await self._stream_request_to_agent(client, endpoint, payload)
+            
+            # Send task to agent
+            response = await client.post(
+                endpoint,
+                content=orjson.dumps(payload),
+                headers=_JSON_HEADERS,
+                timeout=30.0
+            )
+            response.raise_for_status()
+            
+            result = orjson.loads(response.content)
+            
+            # Check for JSON-RPC error
+            if "error" in result:
+                raise Exception(f"Agent returned error: {result['error']}")
+            
+            # Get the response from message/send
+            if "result" not in result:
+                raise Exception("No result in agent response")
+            
+            message_result = result["result"]
+            
+            # For message/send, the response might be a Task or Message
+            if isinstance(message_result, dict):
+                # If it's a Task, we need to poll for completion
+                if "id" in message_result and "status" in message_result:
+                    # message/send usually blocks until the task finishes
+                    task_response = self._task_response_text(message_result)
+                    if task_response is not None:
+                        return task_response
+                    
+                    # The agent returned before the task finished; it will post the
+                    # result to the callback URL, so wait for that instead of polling
+                    if push_id is not None:
+                        try:
+                            return await asyncio.wait_for(self._pending_pushes[push_id], timeout=30.0)
+                        except asyncio.TimeoutError:
+                            return "Task did not complete within timeout"
+                    
+                    task_id = message_result["id"]
+                    
+                    # The tasks/get request is identical for every poll, so encode it once
+                    get_content = orjson.dumps({
+                        "jsonrpc": "2.0",
+                        "id": uuid.uuid4().hex,
+                        "method": "tasks/get",
+                        "params": {
+                            "id": task_id
+                        }
+                    })
+                    
+                    # Poll for task completion with exponential backoff, up to 30 seconds
+                    loop = asyncio.get_running_loop()
+                    deadline = loop.time() + 30.0
+                    delay = 0.05
+                    while loop.time() < deadline:
+                        await asyncio.sleep(delay)
+                        delay = min(delay * 2, 1.0)
                         
-                        # Poll for task completion
-                        for attempt in range(30):  # Poll for up to 30 seconds
-                            await asyncio.sleep(1)
-                            
-                            get_payload = {
-                                "jsonrpc": "2.0",
-                                "id": str(uuid4()),
-                                "method": "tasks/get",
-                                "params": {
-                                    "id": task_id
-                                }
-                            }
-                            
-                            get_response = await client.post(
-                                endpoint,
-                                json=get_payload,
-                                headers={"Content-Type": "application/json"}
-                            )
-                            get_response.raise_for_status()
-                            
-                            get_result = get_response.json()
-                            
-                            if "result" in get_result and get_result["result"]:
-                                task_data = get_result["result"]
-                                
-                                # Check task state
-                                task_state = task_data.get("status", {}).get("state")
-                                
-                                if task_state == "completed":
-                                    # Extract response from artifacts
-                                    artifacts = task_data.get("artifacts", [])
-                                    if artifacts:
-                                        for artifact in artifacts:
-                                            parts = artifact.get("parts", [])
-                                            for part in parts:
-                                                if part.get("kind") == "text":
-                                                    return part.get("text", "No text in response")
-                                    
-                                    return "Task completed but no response text found"
-                                elif task_state == "failed":
-                                    return "Agent task failed"
-                                elif task_state == "input-required":
-                                    # Extract response from status message for input-required state
-                                    status_message = task_data.get("status", {}).get("message", {})
-                                    if status_message:
-                                        parts = status_message.get("parts", [])
-                                        for part in parts:
-                                            if part.get("kind") == "text":
-                                                return part.get("text", "No text in input-required response")
-                                    return "Agent requires input but no message provided"
+                        get_response = await client.post(
+                            endpoint,
+                            content=get_content,
+                            headers=_JSON_HEADERS,
+                            timeout=30.0
+                        )
+                        get_response.raise_for_status()
                         
-                        return "Task did not complete within timeout"
+                        get_result = orjson.loads(get_response.content)
+                        
+                        if "result" in get_result and get_result["result"]:
+                            task_response = self._task_response_text(get_result["result"])
+                            if task_response is not None:
+                                return task_response
                     
-                    # If it's a direct Message response
-                    elif "parts" in message_result:
-                        for part in message_result.get("parts", []):
-                            if part.get("type") == "text":
-                                return part.get("text", "No text in message")
-                        return "Message received but no text content"
+                    return "Task did not complete within timeout"
                 
-                return "Unexpected response format from agent"
+                # If it's a direct Message response
+                elif "parts" in message_result:
+                    for part in message_result.get("parts", []):
+                        if part.get("type") == "text":
+                            return _AgentAnswer(part["text"]) if "text" in part else "No text in message"
+                    return "Message received but no text content"
+            
+            return "Unexpected response format from agent"
                 
         except httpx.HTTPStatusError as e:
             raise Exception(f"HTTP error {e.response.status_code}: {e.response.text}")
         except Exception as e:
             raise Exception(f"Request forwarding failed: {str(e)}")
+        finally:
+            if push_id is not None:
+                self._pending_pushes.pop(push_id, None)
+    
+    def has_pending_push(self, push_id: str) -> bool:
+        """Whether a forwarded request is waiting on push_id"""
+        return push_id in self._pending_pushes
+    
+    def handle_push_notification(self, push_id: str, task_data: Dict) -> bool:
+        """
+        Resolve the forwarded request waiting on push_id once its task finishes.
+        
+        Returns False if no forwarded request is waiting on push_id.
+        """
+        future = self._pending_pushes.get(push_id)
+        if future is None:
+            return False
+        
+        task_response = self._task_response_text(task_data)
+        if task_response is not None and not future.done():
+            future.set_result(task_response)
+        return True
+    
+    async def _stream_request_to_agent(self, client: httpx.AsyncClient, endpoint: str, payload: Dict) -> str:
+        """Send a message/stream request and consume SSE events until the task finishes"""
+        
+        artifacts = []
+        async with client.stream(
+            "POST",
+            endpoint,
+            content=orjson.dumps(payload),
+            headers=_SSE_HEADERS,
+            timeout=30.0
+        ) as response:
+            response.raise_for_status()
+            
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                
+                event = orjson.loads(line[5:])
+                if "error" in event:
+                    raise Exception(f"Agent returned error: {event['error']}")
+                
+                result = event.get("result") or {}
+                kind = result.get("kind")
+                
+                if kind == "artifact-update":
+                    artifacts.append(result.get("artifact", {}))
+                elif kind == "message":
+                    for part in result.get("parts", []):
+                        if part.get("kind") == "text":
+                            return _AgentAnswer(part["text"]) if "text" in part else "No text in message"
+                    return "Message received but no text content"
+                elif kind in ("task", "status-update"):
+                    task_response = self._task_response_text(result, artifacts)
+                    if task_response is not None:
+                        return task_response
+        
+        return "Task stream ended before the task completed"
+    
+    def _task_response_text(self, task_data: Dict, streamed_artifacts: Optional[List[Dict]] = None) -> Optional[str]:
+        """Extract the response text from a task in a terminal state, or None if it is still running"""
+        # Check task state
+        task_state = task_data.get("status", {}).get("state")
+        
+        if task_state == "completed":
+            # Extract response from artifacts
+            artifacts = task_data.get("artifacts") or streamed_artifacts or []
+            for artifact in artifacts:
+                parts = artifact.get("parts", [])
+                for part in parts:
+                    if part.get("kind") == "text":
+                        return _AgentAnswer(part["text"]) if "text" in part else "No text in response"
+            
+            return "Task completed but no response text found"
+        elif task_state == "failed":
+            return "Agent task failed"
+        elif task_state == "input-required":
+            # Extract response from status message for input-required state
+            status_message = task_data.get("status", {}).get("message", {})
+            if status_message:
+                parts = status_message.get("parts", [])
+                for part in parts:
+                    if part.get("kind") == "text":
+                        return part.get("text", "No text in input-required response")
+            return "Agent requires input but no message provided"
+        
+        return None
 
     async def process_request(self, request: str) -> Dict:
         """Process a request through the LangGraph workflow"""
-        initial_state = RouterState(
-            request=request,
-            selected_agent="",
-            confidence=0.0,
-            reasoning="",
-            response="",
-            error="",
-            metadata={}
-        )
+        initial_state = RouterState(request=request)
         
         try:
-            final_state = await self.workflow.ainvoke(initial_state)
+            # Nodes return partial updates; the graph's result is a dict of the final values
+            final_state = await self.workflow.ainvoke(
+                initial_state,
+                config={"configurable": {"orchestrator": self}}
+            )
             
             agent_card = self.agents[final_state["selected_agent"]]
             
@@ -555,11 +862,11 @@ class SmartOrchestrator:
                 "request": request,
                 "selected_agent_id": final_state["selected_agent"],
                 "selected_agent_name": agent_card.name,
-                "agent_skills": [skill.name for skill in agent_card.skills],
+                "agent_skills": list(self._agent_skill_names[final_state["selected_agent"]]),
                 "confidence": final_state["confidence"],
                 "reasoning": final_state["reasoning"],
                 "response": final_state["response"],
-                "metadata": final_state["metadata"]
+                "metadata": _render_metadata(final_state["metadata"])
             }
             
         except Exception as e:
@@ -567,8 +874,8 @@ class SmartOrchestrator:
                 "success": False,
                 "request": request,
                 "error": str(e),
-                "metadata": {
-                    "request_id": str(uuid.uuid4()),
-                    "error_timestamp": datetime.now().isoformat()
-                }
+                "metadata": _render_metadata({
+                    "request_id": uuid.uuid4().hex,
+                    "error_timestamp": time.time_ns()
+                })
             } 
\ No newline at end of file
@@ -1,15 +1,22 @@
 import asyncio
-import base64
+from contextlib import aclosing
+from dataclasses import dataclass
 import os
+import random
+from itertools import chain
+import threading
+import time
 import urllib.parse
 import httpx
 import json
-from uuid import uuid4
+from uuid import UUID
 
 import asyncclick as click
+import pybase64
 
-from a2a.client import A2AClient, A2ACardResolver
+from a2a.client import A2AClient, A2ACardResolver, A2AClientHTTPError
 from a2a.types import (
+    AgentCard,
     Part,
     TextPart,
     FilePart,
@@ -33,83 +40,174 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.push_notification_auth import PushNotificationReceiverAuth
 
+# Task polling backoff: first poll after ~0.1s, doubling up to 2s, with jitter
+POLL_BASE_SECONDS = 0.1
+POLL_CAP_SECONDS = 2.0
+
+# Attachment read size; a multiple of 3 so chunks encode without base64 padding
+B64_CHUNK_BYTES = 57_000
+
+# How long a LIST_AGENTS result is reused before asking the orchestrator again
+AGENT_LIST_TTL_SECONDS = 10.0
+
+# Request and message ids drawn per urandom call
+UUID_BATCH_SIZE = 64
+
+# Orchestrator URL -> (expiry on the monotonic clock, agent list)
+_agent_list_cache: dict[str, tuple[float, list]] = {}
+
+# Agent cards already resolved in this process, keyed by agent URL
+_agent_cards: dict[str, AgentCard] = {}
+
+
+async def get_agent_card(httpx_client, agent_url: str) -> AgentCard:
+    """Resolve an agent card once per URL and reuse it for later commands"""
+    card = _agent_cards.get(agent_url)
+    if card is None:
+        card = await A2ACardResolver(httpx_client, agent_url).get_agent_card()
+        _agent_cards[agent_url] = card
+    return card
+
+
+# A2A clients already built in this process, keyed by agent URL
+_client_cache: dict[str, tuple[AgentCard, A2AClient]] = {}
+
+
+async def get_agent_client(httpx_client, agent_url: str, card: AgentCard | None = None) -> tuple[AgentCard, A2AClient]:
+    """Return the (card, A2AClient) pair for an agent URL, building it on first use"""
+    cached = _client_cache.get(agent_url)
+    if cached is None:
+        if card is None:
+            card = await get_agent_card(httpx_client, agent_url)
+        cached = (card, A2AClient(httpx_client, agent_card=card))
+        _client_cache[agent_url] = cached
+    return cached
+
+
+def invalidate_agent_client(agent_url: str):
+    """Forget the cached card and client for an agent URL"""
+    _client_cache.pop(agent_url, None)
+    _agent_cards.pop(agent_url, None)
+
+
+# Pre-generated random UUIDs, refilled UUID_BATCH_SIZE at a time
+_uuid_pool: list[UUID] = []
+
+
+def next_uuid() -> UUID:
+    """Drop-in for uuid4() that draws ids from one urandom call per batch"""
+    if not _uuid_pool:
+        raw = os.urandom(16 * UUID_BATCH_SIZE)
+        _uuid_pool.extend(UUID(bytes=raw[i:i + 16], version=4) for i in range(0, len(raw), 16))
+    return _uuid_pool.pop()
+
+
+async def prompt_in_thread(text: str, **kwargs) -> str:
+    """
+    Run click.prompt in a daemon thread and await its answer.
+
+    Unlike asyncio.to_thread, the thread is not joined when the loop shuts
+    down, so Ctrl-C at a prompt exits at once instead of waiting on input().
+    Piped input is read inline: a daemon thread blocked on buffered stdin
+    would abort interpreter shutdown, and piped lines are already waiting.
+    """
+    if not sys.stdin.isatty():
+        return click.prompt(text, **kwargs)
+
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def settle(result=None, error=None):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def run():
+        try:
+            result = click.prompt(text, **kwargs)
+        except BaseException as e:
+            result, error = None, e
+        else:
+            error = None
+        try:
+            loop.call_soon_threadsafe(settle, result, error)
+        except RuntimeError:
+            # The loop already closed after an interrupt; nobody is waiting
+            pass
+
+    threading.Thread(target=run, name="click-prompt", daemon=True).start()
+    return await future
+
+
+def encode_file_base64(file_path: str) -> str:
+    """Base64-encode a file chunk by chunk instead of reading it into memory at once"""
+    size = os.path.getsize(file_path)
+    encoded = bytearray(4 * ((size + 2) // 3))
+    offset = 0
+    with open(file_path, "rb") as f:
+        while chunk := f.read(B64_CHUNK_BYTES):
+            piece = pybase64.b64encode(chunk)
+            encoded[offset:offset + len(piece)] = piece
+            offset += len(piece)
+    # Trim in place rather than slicing, which would copy the whole buffer;
+    # only needed if the file shrank after it was sized
+    del encoded[offset:]
+    return encoded.decode("ascii")
+
+
+_SEP = "=" * 60
+
+
+def _emit(title: str, *lines):
+    """Print a titled block framed by separator lines with a single write"""
+    print("\n".join(("", _SEP, title, _SEP, *lines, _SEP)))
+
+
+def _first_artifact_text(artifacts):
+    """Return the text of the first text part in A2A task artifacts, if any"""
+    parts = chain.from_iterable(artifact.get('parts', []) for artifact in artifacts)
+    return next((part.get('text', '') for part in parts if part.get('kind') == 'text'), None)
+
 
 def format_ai_response(content):
     """Format AI response for better readability."""
-    if isinstance(content, dict):
+    match content:
         # Handle A2A task artifacts (from orchestrator)
-        if 'artifacts' in content:
-            artifacts = content.get('artifacts', [])
-            if artifacts:
-                for artifact in artifacts:
-                    parts = artifact.get('parts', [])
-                    for part in parts:
-                        if part.get('kind') == 'text':
-                            text = part.get('text', '')
-                            # Extract just the final answer from orchestrator response
-                            if '→' in text:
-                                # Split on → and take the part after it
-                                answer = text.split('→', 1)[-1].strip()
-                                print("\n" + "="*60)
-                                print("🤖 AI RESPONSE")
-                                print("="*60)
-                                print(answer)
-                                print("="*60)
-                                return True
-                            else:
-                                print("\n" + "="*60)
-                                print("🤖 AI RESPONSE")
-                                print("="*60)
-                                print(text)
-                                print("="*60)
-                                return True
+        case {'artifacts': [*artifacts]} if (text := _first_artifact_text(artifacts)) is not None:
+            # Extract just the final answer from orchestrator response: the part after →
+            _, sep, answer = text.partition('→')
+            _emit("🤖 AI RESPONSE", answer.strip() if sep else text)
+        
+        # Handle task list from planner
+        case {'content': {'tasks': tasks} as ai_content}:
+            task_info = ai_content.get('task_info', {})
+            lines = [
+                f"Original Query: {ai_content.get('original_query', 'N/A')}",
+                f"Task Type: {task_info.get('task_type', 'N/A')}",
+                f"Scope: {task_info.get('scope', 'N/A')}",
+                "\n📋 TASKS:",
+            ]
+            for task in tasks:
+                lines.append(f"  • Task {task.get('id', 'N/A')}: {task.get('description', 'N/A')}")
+                lines.append(f"    Status: {task.get('status', 'N/A')}")
+            _emit("🤖 AI PLANNER RESPONSE", *lines)
+        
+        # Handle other structured content
+        case {'content': dict() as ai_content}:
+            # Avoid nested content
+            _emit("🤖 AI RESPONSE", *(f"{key}: {value}" for key, value in ai_content.items() if key != 'content'))
         
-        # Handle structured data
-        if 'content' in content:
-            ai_content = content['content']
-            if isinstance(ai_content, dict):
-                # Handle task list from planner
-                if 'tasks' in ai_content:
-                    print("\n" + "="*60)
-                    print("🤖 AI PLANNER RESPONSE")
-                    print("="*60)
-                    print(f"Original Query: {ai_content.get('original_query', 'N/A')}")
-                    print(f"Task Type: {ai_content.get('task_info', {}).get('task_type', 'N/A')}")
-                    print(f"Scope: {ai_content.get('task_info', {}).get('scope', 'N/A')}")
-                    print("\n📋 TASKS:")
-                    for task in ai_content.get('tasks', []):
-                        print(f"  • Task {task.get('id', 'N/A')}: {task.get('description', 'N/A')}")
-                        print(f"    Status: {task.get('status', 'N/A')}")
-                    print("="*60)
-                    return True
-                else:
-                    # Handle other structured content
-                    print("\n" + "="*60)
-                    print("🤖 AI RESPONSE")
-                    print("="*60)
-                    for key, value in ai_content.items():
-                        if key != 'content':  # Avoid nested content
-                            print(f"{key}: {value}")
-                    print("="*60)
-                    return True
-            elif isinstance(ai_content, str):
-                # Handle text content
-                print("\n" + "="*60)
-                print("🤖 AI RESPONSE")
-                print("="*60)
-                print(ai_content)
-                print("="*60)
-                return True
-    elif isinstance(content, str):
-        # Handle direct string content
-        print("\n" + "="*60)
-        print("🤖 AI RESPONSE")
-        print("="*60)
-        print(content)
-        print("="*60)
-        return True
+        # Handle text content, or direct string content
+        case {'content': str() as text} | (str() as text):
+            _emit("🤖 AI RESPONSE", text)
+        
+        case _:
+            return False
     
-    return False
+    return True
 
 
 async def list_available_agents(httpx_client, agent_url: str, card):
@@ -117,34 +215,33 @@ async def list_available_agents(httpx_client, agent_url: str, card):
     try:
         # Check if this is the orchestrator by looking at the agent card
         if "orchestrator" in card.name.lower() or "routing" in card.description.lower():
-            print("\n" + "="*60)
-            print("🤖 AVAILABLE AGENTS")
-            print("="*60)
-            
             # Get agents from orchestrator via API call
-            available_agents = await get_agents_from_orchestrator(httpx_client, agent_url)
+            available_agents = await get_agents_from_orchestrator(httpx_client, agent_url, card=card)
             
+            # Collect the whole listing and print it in one write
+            lines = ["", _SEP, "🤖 AVAILABLE AGENTS", _SEP]
             if available_agents:
-                print(f"Found {len(available_agents)} available agents:")
+                lines.append(f"Found {len(available_agents)} available agents:")
                 for i, agent in enumerate(available_agents, 1):
-                    print(f"\n{i}. {agent['name']} ({agent['endpoint']})")
-                    print(f"   Description: {agent['description']}")
+                    lines.append(f"\n{i}. {agent['name']} ({agent['endpoint']})")
+                    lines.append(f"   Description: {agent['description']}")
                     if agent['skills']:
                         skills_text = ", ".join([skill.get('name', 'Unknown') for skill in agent['skills'][:3]])
                         if len(agent['skills']) > 3:
                             skills_text += f" (+{len(agent['skills'])-3} more)"
-                        print(f"   Skills: {skills_text}")
-                print("\n" + "="*60)
-                print("💡 The orchestrator will automatically route your requests to the best agent!")
+                        lines.append(f"   Skills: {skills_text}")
+                lines.append("\n" + _SEP)
+                lines.append("💡 The orchestrator will automatically route your requests to the best agent!")
             else:
-                print("⚠️  No agents currently available")
-            print("="*60)
+                lines.append("⚠️  No agents currently available")
+            lines.append(_SEP)
+            print("\n".join(lines))
     except Exception as e:
         # Silently fail if we can't get agent info
         pass
 
 
-async def send_orchestrator_command(httpx_client, orchestrator_url: str, command: str, timeout_seconds: int = 10, poll_interval: float = 0.5):
+async def send_orchestrator_command(httpx_client, orchestrator_url: str, command: str, timeout_seconds: int = 10, card: AgentCard | None = None):
     """
     Common function to send commands to orchestrator via A2A protocol
     
@@ -153,22 +250,20 @@ async def send_orchestrator_command(httpx_client, orchestrator_url: str, command
         orchestrator_url: URL of the orchestrator
         command: Command to send (e.g., "LIST_AGENTS", "REGISTER_AGENT:url", "UNREGISTER_AGENT:id")
         timeout_seconds: Maximum time to wait for task completion
-        poll_interval: Interval between polling attempts
+        card: Already resolved orchestrator agent card, if the caller has one
     
     Returns:
         dict: Response data with 'success', 'data', and optional 'error' fields
     """
     try:
-        # Create A2A client
-        card_resolver = A2ACardResolver(httpx_client, orchestrator_url)
-        card = await card_resolver.get_agent_card()
-        client = A2AClient(httpx_client, agent_card=card)
+        # Reuse the A2A client built for this orchestrator
+        card, client = await get_agent_client(httpx_client, orchestrator_url, card)
         
         # Send command
         message = Message(
             role=Role.user,
             parts=[Part(root=TextPart(text=command))],
-            messageId=str(uuid4()),
+            messageId=str(next_uuid()),
         )
         
         payload = MessageSendParams(
@@ -180,7 +275,7 @@ async def send_orchestrator_command(httpx_client, orchestrator_url: str, command
         
         response = await client.send_message(
             SendMessageRequest(
-                id=str(uuid4()),
+                id=str(next_uuid()),
                 params=payload,
             )
         )
@@ -193,30 +288,45 @@ async def send_orchestrator_command(httpx_client, orchestrator_url: str, command
             if isinstance(result, Task):
                 task_id = result.id
                 
-                # Poll for completion
-                max_polls = int(timeout_seconds / poll_interval)
-                for _ in range(max_polls):
-                    await asyncio.sleep(poll_interval)
-                    task_response = await client.get_task(
-                        GetTaskRequest(
-                            id=str(uuid4()),
-                            params=TaskQueryParams(id=task_id),
+                # Poll for completion with jittered exponential backoff
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + timeout_seconds
+                attempt = 0
+                last_state = result.status.state
+                while loop.time() < deadline:
+                    interval = min(POLL_CAP_SECONDS, POLL_BASE_SECONDS * 2 ** attempt) * random.uniform(0.5, 1.5)
+                    await asyncio.sleep(min(interval, max(deadline - loop.time(), 0)))
+                    attempt += 1
+                    
+                    try:
+                        task_response = await client.get_task(
+                            GetTaskRequest(
+                                id=str(next_uuid()),
+                                params=TaskQueryParams(id=task_id),
+                            )
                         )
-                    )
+                    except A2AClientHTTPError as e:
+                        # Retry only transient failures: 5xx, and connection errors,
+                        # which the A2A client reports as 503. Anything else (e.g.
+                        # 401/403) goes to the handler below, which invalidates the client.
+                        if e.status_code >= 500:
+                            continue
+                        raise
                     
                     if hasattr(task_response, 'root') and hasattr(task_response.root, 'result'):
                         task_data = task_response.root.result
                         if hasattr(task_data, 'status') and hasattr(task_data.status, 'state'):
+                            # The task moved on (e.g. submitted -> working); poll quickly again
+                            if task_data.status.state != last_state:
+                                last_state = task_data.status.state
+                                attempt = 0
+                            
                             if task_data.status.state == TaskState.completed:
-                                # Extract response text from artifacts
-                                response_text = ""
-                                if hasattr(task_data, 'artifacts') and task_data.artifacts:
-                                    for artifact in task_data.artifacts:
-                                        if hasattr(artifact, 'parts'):
-                                            for part in artifact.parts:
-                                                if hasattr(part, 'root') and isinstance(part.root, TextPart):
-                                                    response_text = part.root.text
-                                                    break
+                                # Extract response text from the first text part of any artifact
+                                parts = chain.from_iterable(artifact.parts for artifact in task_data.artifacts or [])
+                                response_text = next(
+                                    (part.root.text for part in parts if isinstance(part.root, TextPart)), ""
+                                )
                                 
                                 return {
                                     "success": True,
@@ -238,11 +348,9 @@ async def send_orchestrator_command(httpx_client, orchestrator_url: str, command
             
             # If it's a direct message response
             elif isinstance(result, Message):
-                response_text = ""
-                for part in result.parts:
-                    if hasattr(part, 'root') and isinstance(part.root, TextPart):
-                        response_text = part.root.text
-                        break
+                response_text = next(
+                    (part.root.text for part in result.parts if isinstance(part.root, TextPart)), ""
+                )
                 
                 return {
                     "success": True,
@@ -260,6 +368,14 @@ async def send_orchestrator_command(httpx_client, orchestrator_url: str, command
             "error": "No result in response"
         }
         
+    except A2AClientHTTPError as e:
+        if e.status_code in (401, 403):
+            # Credentials or card may have changed; rebuild on the next command
+            invalidate_agent_client(orchestrator_url)
+        return {
+            "success": False,
+            "error": str(e)
+        }
     except Exception as e:
         return {
             "success": False,
@@ -267,17 +383,24 @@ async def send_orchestrator_command(httpx_client, orchestrator_url: str, command
         }
 
 
-async def get_agents_from_orchestrator(httpx_client, orchestrator_url: str):
+async def get_agents_from_orchestrator(httpx_client, orchestrator_url: str, card: AgentCard | None = None):
     """Get agent list from orchestrator via API call"""
+    cached = _agent_list_cache.get(orchestrator_url)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    
     try:
-        response = await send_orchestrator_command(httpx_client, orchestrator_url, "LIST_AGENTS", timeout_seconds=5)
+        response = await send_orchestrator_command(
+            httpx_client, orchestrator_url, "LIST_AGENTS", timeout_seconds=5, card=card
+        )
         
         if response["success"]:
             # Parse the JSON response
-            import json
             agent_data = json.loads(response["data"])
             if agent_data.get("type") == "agent_list":
-                return agent_data.get("agents", [])
+                agents = agent_data.get("agents", [])
+                _agent_list_cache[orchestrator_url] = (time.monotonic() + AGENT_LIST_TTL_SECONDS, agents)
+                return agents
         else:
             print(f"⚠️  Could not get agent list from orchestrator: {response.get('error', 'Unknown error')}")
         
@@ -287,28 +410,33 @@ async def get_agents_from_orchestrator(httpx_client, orchestrator_url: str):
         return []
 
 
+def split_agent_list(value: str) -> list[str]:
+    """Split a comma-separated --register_agent/--unregister_agent value"""
+    return [item for item in (part.strip() for part in value.split(",")) if item]
+
+
 async def register_agent_with_orchestrator(httpx_client, orchestrator_url: str, agent_url: str):
     """Register an agent with the orchestrator"""
     print(f"🔄 Registering agent {agent_url} with orchestrator {orchestrator_url}")
     
     try:
-        print(f"📤 Sending registration request...")
+        print(f"📤 Sending registration request for {agent_url}...")
         response = await send_orchestrator_command(
             httpx_client, 
             orchestrator_url, 
             f"REGISTER_AGENT:{agent_url}", 
-            timeout_seconds=30,
-            poll_interval=1.0
+            timeout_seconds=30
         )
         
         if response["success"]:
-            print(f"🎉 Registration completed successfully!")
-            print(f"📄 {response['data']}")
+            # The orchestrator's agent list just changed
+            _agent_list_cache.pop(orchestrator_url, None)
+            print(f"🎉 Registration of {agent_url} completed successfully!\n📄 {response['data']}")
         else:
-            print(f"❌ Registration failed: {response.get('error', 'Unknown error')}")
+            print(f"❌ Registration of {agent_url} failed: {response.get('error', 'Unknown error')}")
             
     except Exception as e:
-        print(f"❌ Registration failed: {e}")
+        print(f"❌ Registration of {agent_url} failed: {e}")
 
 
 async def unregister_agent_with_orchestrator(httpx_client, orchestrator_url: str, agent_identifier: str):
@@ -316,33 +444,44 @@ async def unregister_agent_with_orchestrator(httpx_client, orchestrator_url: str
     print(f"🔄 Unregistering agent {agent_identifier} from orchestrator {orchestrator_url}")
     
     try:
-        print(f"📤 Sending unregistration request...")
+        print(f"📤 Sending unregistration request for {agent_identifier}...")
         response = await send_orchestrator_command(
             httpx_client, 
             orchestrator_url, 
             f"UNREGISTER_AGENT:{agent_identifier}", 
-            timeout_seconds=30,
-            poll_interval=1.0
+            timeout_seconds=30
         )
         
         if response["success"]:
-            print(f"🎉 Unregistration completed successfully!")
-            print(f"📄 {response['data']}")
+            # The orchestrator's agent list just changed
+            _agent_list_cache.pop(orchestrator_url, None)
+            print(f"🎉 Unregistration of {agent_identifier} completed successfully!\n📄 {response['data']}")
         else:
-            print(f"❌ Unregistration failed: {response.get('error', 'Unknown error')}")
+            print(f"❌ Unregistration of {agent_identifier} failed: {response.get('error', 'Unknown error')}")
             
     except Exception as e:
-        print(f"❌ Unregistration failed: {e}")
+        print(f"❌ Unregistration of {agent_identifier} failed: {e}")
+
+
+@dataclass(slots=True, frozen=True)
+class CLIConfig:
+    """Settings for one interactive session, resolved once from the CLI options"""
+    streaming: bool
+    use_push_notifications: bool
+    notification_receiver_host: str
+    notification_receiver_port: int
+    context_id: str | int
+    history: bool
 
 
 @click.command()
 @click.option("--agent", default="http://localhost:8000")
 @click.option("--list_agent", is_flag=True, help="List all available agents from orchestrator")
-@click.option("--register_agent", default="")
-@click.option("--unregister_agent", default="")
-@click.option("--session", default=0)
-@click.option("--history", default=False)
-@click.option("--use_push_notifications", default=False)
+@click.option("--register_agent", default="", help="Comma-separated agent URLs to register")
+@click.option("--unregister_agent", default="", help="Comma-separated agent URLs or names to unregister")
+@click.option("--session", type=int, default=0)
+@click.option("--history", type=bool, default=False)
+@click.option("--use_push_notifications", type=bool, default=False)
 @click.option("--push_notification_receiver", default="http://localhost:5000")
 @click.option("--header", multiple=True)
 async def orchestratorClient(
@@ -356,11 +495,17 @@ async def orchestratorClient(
     push_notification_receiver: str,
     header,
 ):
-    headers = {h.split("=")[0]: h.split("=")[1] for h in header}
+    # partition keeps any "=" in the value (e.g. base64 tokens)
+    headers = {name: value for name, _, value in (h.partition("=") for h in header)}
     print(f"Will use headers: {headers}")
-    async with httpx.AsyncClient(timeout=30, headers=headers) as httpx_client:
-        card_resolver = A2ACardResolver(httpx_client, agent)
-        card = await card_resolver.get_agent_card()
+    # One pooled HTTP/2 client for every A2A call made by this session
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=30.0),
+        retries=2,
+    )
+    async with httpx.AsyncClient(timeout=30, headers=headers, transport=transport) as httpx_client:
+        card = await get_agent_card(httpx_client, agent)
 
         print("======= Agent Card ========")
         print(card.model_dump_json(exclude_none=True))
@@ -370,99 +515,119 @@ async def orchestratorClient(
             await list_available_agents(httpx_client, agent, card)
             return
         
-        # Handle register_agent option
+        # Handle register_agent option; several agents are sent concurrently
+        # and each coroutine reports its own outcome
         if register_agent != "":
-            await register_agent_with_orchestrator(httpx_client, agent, register_agent)
+            await asyncio.gather(*(
+                register_agent_with_orchestrator(httpx_client, agent, url)
+                for url in split_agent_list(register_agent)
+            ))
             return
         if unregister_agent != "":
-            await unregister_agent_with_orchestrator(httpx_client, agent, unregister_agent)
+            await asyncio.gather(*(
+                unregister_agent_with_orchestrator(httpx_client, agent, identifier)
+                for identifier in split_agent_list(unregister_agent)
+            ))
             return
 
-        # Default behavior: show available agents and continue with interactive mode
-        await list_available_agents(httpx_client, agent, card)
+        # Default behavior: show available agents and continue with interactive mode,
+        # fetching the agent list while the notification listener starts
+        agents_task = asyncio.create_task(list_available_agents(httpx_client, agent, card))
 
         notif_receiver_parsed = urllib.parse.urlparse(push_notification_receiver)
         notification_receiver_host = notif_receiver_parsed.hostname or "localhost"
         notification_receiver_port = notif_receiver_parsed.port or 5000
 
-        if use_push_notifications:
-            from utils.push_notification_listener import (
-                PushNotificationListener,
-            )
+        _, client = await get_agent_client(httpx_client, agent, card)
+        config = CLIConfig(
+            streaming=card.capabilities.streaming,
+            use_push_notifications=use_push_notifications,
+            notification_receiver_host=notification_receiver_host,
+            notification_receiver_port=notification_receiver_port,
+            context_id=session if session > 0 else next_uuid().hex,
+            history=history,
+        )
 
-            notification_receiver_auth = PushNotificationReceiverAuth()
-            await notification_receiver_auth.load_jwks(f"{agent}/.well-known/jwks.json")
+        # The listener lives exactly as long as the interactive session
+        async with asyncio.TaskGroup() as tg:
+            push_notification_listener = None
+            if use_push_notifications:
+                from utils.push_notification_listener import (
+                    PushNotificationListener,
+                )
 
-            push_notification_listener = PushNotificationListener(
-                host=notification_receiver_host,
-                port=notification_receiver_port,
-                notification_receiver_auth=notification_receiver_auth,
-            )
-            push_notification_listener.start()
-
-        client = A2AClient(httpx_client, agent_card=card)
-
-        continue_loop = True
-        streaming = card.capabilities.streaming
-        context_id = session if session > 0 else uuid4().hex
-
-        while continue_loop:
-            print("=========  starting a new task ======== ")
-            continue_loop, _, taskId = await completeTask(
-                client,
-                streaming,
-                use_push_notifications,
-                notification_receiver_host,
-                notification_receiver_port,
-                None,
-                context_id,
-            )
+                notification_receiver_auth = PushNotificationReceiverAuth()
+                await notification_receiver_auth.load_jwks(f"{agent}/.well-known/jwks.json")
 
-            if history and continue_loop:
-                print("========= history ======== ")
-                task_response = await client.get_task(
-                    GetTaskRequest(
-                        id=str(uuid4()),
-                        params=TaskQueryParams(id=taskId or "", historyLength=10),
-                    )
+                push_notification_listener = PushNotificationListener(
+                    host=notification_receiver_host,
+                    port=notification_receiver_port,
+                    notification_receiver_auth=notification_receiver_auth,
                 )
-                print(
-                    task_response.model_dump_json(include={"result": {"history": True}})
+                tg.create_task(push_notification_listener.serve())
+
+            await agents_task
+
+            try:
+                await interactive_loop(client, config)
+            finally:
+                if push_notification_listener is not None:
+                    push_notification_listener.stop()
+
+
+async def interactive_loop(client: A2AClient, config: CLIConfig):
+    continue_loop = True
+    while continue_loop:
+        print("=========  starting a new task ======== ")
+        continue_loop, _, taskId = await completeTask(client, config, None, config.context_id)
+
+        if config.history and continue_loop:
+            print("========= history ======== ")
+            task_response = await client.get_task(
+                GetTaskRequest(
+                    id=str(next_uuid()),
+                    params=TaskQueryParams(id=taskId or "", historyLength=10),
                 )
+            )
+            print(
+                task_response.model_dump_json(include={"result": {"history": True}})
+            )
 
 
-async def completeTask(
-    client: A2AClient,
-    streaming,
-    use_push_notifications: bool,
-    notification_receiver_host: str,
-    notification_receiver_port: int,
-    taskId,
-    contextId,
-):
-    prompt = click.prompt(
+async def completeTask(client: A2AClient, config: CLIConfig, taskId, contextId):
+    ## keep prompting while the agent needs more input for the same task
+    while True:
+        continue_loop, contextId, taskId, state = await _single_turn(client, config, taskId, contextId)
+        if not continue_loop or state != TaskState.input_required:
+            return continue_loop, contextId, taskId
+
+
+async def _single_turn(client: A2AClient, config: CLIConfig, taskId, contextId):
+    """Send one prompt and print the result; returns (continue_loop, contextId, taskId, state)"""
+    # Prompts block, so they run off the event loop to keep the push
+    # notification listener responsive while waiting for input
+    prompt = await prompt_in_thread(
         "\nWhat do you want to send to the agent? (:q or quit to exit)"
     )
     if prompt == ":q" or prompt == "quit":
-        return False, None, None
+        return False, None, None, None
 
     message = Message(
         role=Role.user,
         parts=[Part(root=TextPart(text=prompt))],
-        messageId=str(uuid4()),
+        messageId=str(next_uuid()),
         taskId=taskId,
         contextId=contextId,
     )
 
-    file_path = click.prompt(
+    file_path = await prompt_in_thread(
         "Select a file path to attach? (press enter to skip)",
         default="",
         show_default=False,
     )
     if file_path and file_path.strip() != "":
-        with open(file_path, "rb") as f:
-            file_content = base64.b64encode(f.read()).decode("utf-8")
-            file_name = os.path.basename(file_path)
+        file_content = encode_file_base64(file_path)
+        file_name = os.path.basename(file_path)
 
         message.parts.append(
             Part(root=FilePart(file=FileWithBytes(name=file_name, bytes=file_content)))
@@ -475,39 +640,43 @@ async def completeTask(
         ),
     )
 
-    if use_push_notifications:
+    if config.use_push_notifications:
         # Note: This is a simplified version; proper implementation would need to handle push notifications
         pass
 
     taskResult = None
     response_message = None
-    if streaming:
-        response_stream = client.send_message_streaming(
-            SendStreamingMessageRequest(
-                id=str(uuid4()),
-                params=payload,
+    if config.streaming:
+        # aclosing shuts the SSE response on every exit path, so an early
+        # return on an error event does not leave a half-read connection
+        async with aclosing(
+            client.send_message_streaming(
+                SendStreamingMessageRequest(
+                    id=str(next_uuid()),
+                    params=payload,
+                )
             )
-        )
-        async for result in response_stream:
-            if isinstance(result.root, JSONRPCErrorResponse):
-                print("Error: ", result.root.error)
-                return False, contextId, taskId
-            event = result.root.result
-            contextId = event.contextId
-            if isinstance(event, Task):
-                taskId = event.id
-            elif isinstance(event, TaskStatusUpdateEvent) or isinstance(
-                event, TaskArtifactUpdateEvent
-            ):
-                taskId = event.taskId
-            elif isinstance(event, Message):
-                response_message = event
-            print(f"stream event => {event.model_dump_json(exclude_none=True)}")
+        ) as response_stream:
+            async for result in response_stream:
+                if isinstance(result.root, JSONRPCErrorResponse):
+                    print("Error: ", result.root.error)
+                    return False, contextId, taskId, None
+                event = result.root.result
+                contextId = event.contextId
+                if isinstance(event, Task):
+                    taskId = event.id
+                elif isinstance(event, TaskStatusUpdateEvent) or isinstance(
+                    event, TaskArtifactUpdateEvent
+                ):
+                    taskId = event.taskId
+                elif isinstance(event, Message):
+                    response_message = event
+                print(f"stream event => {event.model_dump_json(exclude_none=True)}")
         # Upon completion of the stream. Retrieve the full task if one was made.
         if taskId:
             taskResult = await client.get_task(
                 GetTaskRequest(
-                    id=str(uuid4()),
+                    id=str(next_uuid()),
                     params=TaskQueryParams(id=taskId),
                 )
             )
@@ -517,7 +686,7 @@ async def completeTask(
             # For non-streaming, assume the response is a task or message.
             event = await client.send_message(
                 SendMessageRequest(
-                    id=str(uuid4()),
+                    id=str(next_uuid()),
                     params=payload,
                 )
             )
@@ -534,57 +703,30 @@ async def completeTask(
             response_message = event
 
     if response_message:
-        # Try to format AI response for readability
-        message_content = response_message.model_dump_json(exclude_none=True)
-        try:
-            content_data = json.loads(message_content)
-            if not format_ai_response(content_data):
-                print(f"\n{message_content}")
-        except:
-            print(f"\n{message_content}")
-        return True, contextId, taskId
+        # Try to format AI response for readability; serialize only for the raw fallback
+        content_data = response_message.model_dump(mode="json", exclude_none=True)
+        if not format_ai_response(content_data):
+            print(f"\n{response_message.model_dump_json(exclude_none=True)}")
+        return True, contextId, taskId, None
     if taskResult:
-        # Try to format AI response for readability
-        task_content = taskResult.model_dump_json(
-            exclude={
-                "history": {
-                    "__all__": {
-                        "parts": {
-                            "__all__": {"file"},
-                        },
+        # Try to format AI response for readability; serialize only for the raw fallback
+        exclude = {
+            "history": {
+                "__all__": {
+                    "parts": {
+                        "__all__": {"file"},
                     },
                 },
             },
-            exclude_none=True,
-        )
-        
-        try:
-            content_data = json.loads(task_content)
-            if not format_ai_response(content_data):
-                print(f"\n{task_content}")
-        except:
-            print(f"\n{task_content}")
+        }
+        content_data = taskResult.model_dump(mode="json", exclude=exclude, exclude_none=True)
+        if not format_ai_response(content_data):
+            print(f"\n{taskResult.model_dump_json(exclude=exclude, exclude_none=True)}")
         
-        ## if the result is that more input is required, loop again.
-        state = TaskState(taskResult.status.state)
-        if state.name == TaskState.input_required.name:
-            return (
-                await completeTask(
-                    client,
-                    streaming,
-                    use_push_notifications,
-                    notification_receiver_host,
-                    notification_receiver_port,
-                    taskId,
-                    contextId,
-                ),
-                contextId,
-                taskId,
-            )
-        ## task is complete
-        return True, contextId, taskId
+        ## if the result is that more input is required, the caller prompts again.
+        return True, contextId, taskId, TaskState(taskResult.status.state)
     ## Failure case, shouldn't reach
-    return True, contextId, taskId
+    return True, contextId, taskId, None
 
 
 if __name__ == "__main__":
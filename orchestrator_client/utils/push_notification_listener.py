@@ -1,13 +1,27 @@
-import asyncio
-import threading
+import contextlib
 import traceback
 
+import uvicorn
+
 from .push_notification_auth import PushNotificationReceiverAuth
 from starlette.applications import Starlette
 from starlette.requests import Request
 from starlette.responses import Response
 
 
+class _EmbeddedServer(uvicorn.Server):
+    """uvicorn server that leaves SIGINT/SIGTERM handling to the host application"""
+
+    def install_signal_handlers(self):
+        # uvicorn < 0.29
+        pass
+
+    @contextlib.contextmanager
+    def capture_signals(self):
+        # uvicorn >= 0.29
+        yield
+
+
 class PushNotificationListener:
     def __init__(
         self,
@@ -18,27 +32,6 @@ class PushNotificationListener:
         self.host = host
         self.port = port
         self.notification_receiver_auth = notification_receiver_auth
-        self.loop = asyncio.new_event_loop()
-        self.thread = threading.Thread(
-            target=lambda loop: loop.run_forever(), args=(self.loop,)
-        )
-        self.thread.daemon = True
-        self.thread.start()
-
-    def start(self):
-        try:
-            # Need to start server in separate thread as current thread
-            # will be blocked when it is waiting on user prompt.
-            asyncio.run_coroutine_threadsafe(
-                self.start_server(),
-                self.loop,
-            )
-            print('======= push notification listener started =======')
-        except Exception as e:
-            print(e)
-
-    async def start_server(self):
-        import uvicorn
 
         self.app = Starlette()
         self.app.add_route(
@@ -51,8 +44,26 @@ class PushNotificationListener:
         config = uvicorn.Config(
             self.app, host=self.host, port=self.port, log_level='critical'
         )
-        self.server = uvicorn.Server(config)
-        await self.server.serve()
+        # Built up front so stop() works even before serve() has started
+        self.server = _EmbeddedServer(config)
+
+    def stop(self):
+        # Ask uvicorn to shut down; serve() returns once it has, or skips
+        # starting at all if it has not begun yet
+        self.server.should_exit = True
+
+    async def serve(self):
+        # Runs on the caller's event loop until stop() is called, so the
+        # caller must not block that loop (e.g. run user prompts in a thread).
+        # Ctrl-C stays with the caller: the server installs no signal handlers.
+        if self.server.should_exit:
+            return
+        print('======= push notification listener started =======')
+        try:
+            await self.server.serve()
+        except (Exception, SystemExit) as e:
+            # uvicorn exits the process on startup failures such as a busy port
+            print(f'push notification listener stopped: {e}')
 
     async def handle_validation_check(self, request: Request):
         validation_token = request.query_params.get('validationToken')